@@ -0,0 +1,215 @@
+import asyncio
+import time
+
+import metrics
+import protocol
+from card_pool import CardPool
+from game_log import GameLogger, log_file_name
+from game_state import GameState
+from main import JOIN_TIMEOUT, BingoCard
+from scheduler import DrawScheduler, RoundTiming
+
+
+class AsyncBingoServer:
+    # Ereignisgesteuerter Spielleiter: Ein einziger Event-Loop nimmt alle Verbindungen an, verteilt die gezogenen
+    # Wörter und sammelt die WIN-Meldungen ein – ohne Prozess pro Spieler und ohne Polling.
+    def __init__(self, num_players, words, player_names, server_ip, server_port,
+                 timing=RoundTiming(), logger=None, card_size=None, pool=None):
+        self.num_players = num_players
+        self.words = words
+        self.player_names = player_names
+        self.server_ip = server_ip
+        self.server_port = server_port  # Port 0 wählt einen freien Port, der nach start() hier steht.
+        self.timing = timing  # Rundendauer und Pause, siehe RoundTiming.
+        self.scheduler = DrawScheduler(words)
+        self.logger = logger  # Optionaler GameLogger; ohne Logger wird nichts protokolliert.
+        self.card_size = card_size  # Mit Kartengröße teilt der Server jedem Spieler beim Verbinden eine Karte zu.
+        self.pool = pool or CardPool(words)  # Mehrere Spiele (siehe lobby.py) können sich einen Kartengenerator teilen.
+        self.cards = self.pool.generate(num_players, card_size) if card_size else []
+
+        self.writers = {}  # Spieler-ID -> StreamWriter der Verbindung.
+        self.handlers = set()  # Laufende Verbindungs-Tasks, damit close() auf ihr Ende warten kann.
+        self.all_connected = asyncio.Event()
+        self.winner_event = asyncio.Event()
+        self.round_event = asyncio.Event()  # Gesetzt, sobald alle Spieler geantwortet haben oder jemand gewinnt.
+        # Runde, gezogene Wörter, Markierungen und Gewinner; mit Karten prüft der Zustand Markierungen und Bingo selbst.
+        cards = [BingoCard(self.pool.card_rows(card, card_size)) for card in self.cards] if self.cards else None
+        self.state = GameState(num_players, cards)
+        self.state.subscribe(self.on_state_change)
+        self.server = None
+
+    @property
+    def winner(self):
+        return self.state.winner  # 1-basierte Spieler-ID des Gewinners, 0 solange es keinen gibt.
+
+    @property
+    def round_count(self):
+        return self.state.round_count
+
+    def log(self, event, player=None):
+        if self.logger is not None:
+            self.logger.log(event, self.round_count, player)
+
+    async def start(self):
+        # Öffnet den Listen-Socket; der Event-Loop wartet auf neue Verbindungen statt aktiv zu pollen.
+        self.server = await asyncio.start_server(self.handle_player, self.server_ip, self.server_port,
+                                                 backlog=max(self.num_players, 128))
+        self.server_port = self.server.sockets[0].getsockname()[1]
+
+    async def handle_player(self, reader, writer):
+        # Die Spieler verbinden sich in zufälliger Reihenfolge; die Spieler-ID (und damit Name und Karte) kommt
+        # daher wie in master_process aus der JOIN-Nachricht des Spielers.
+        decoder = protocol.FrameDecoder()
+        messages = []
+        try:
+            while not messages:  # Die JOIN-Nachricht kann auf mehrere TCP-Segmente verteilt ankommen.
+                messages = await asyncio.wait_for(protocol.read_messages(reader, decoder), JOIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass  # Ohne JOIN erhält der Spieler die erste freie ID.
+        except (ConnectionError, ValueError):
+            writer.close()
+            return
+        join = messages[0] if messages and messages[0].type == protocol.JOIN else None
+        player_id = protocol.join_player_id(join, self.player_names, self.writers)
+        if player_id is None:
+            writer.close()  # Weist Verbindungen ab, sobald alle Plätze vergeben sind.
+            return
+        self.connect_player(player_id, writer)
+        await self.serve_player(player_id, reader, writer, decoder, messages[1:] if join else messages)
+
+    def connect_player(self, player_id, writer, **fields):
+        # Registriert die Verbindung und teilt dem Spieler per STATE seine Karte und ggf. weitere Angaben zu.
+        self.writers[player_id] = writer
+        if self.cards:
+            fields["card"] = self.pool.card_rows(self.cards[player_id], self.card_size)
+        if self.cards or fields:
+            writer.write(protocol.encode_state(0, player_id=player_id, **fields))
+        if len(self.writers) == self.num_players:
+            self.all_connected.set()
+
+    async def serve_player(self, player_id, reader, writer, decoder, pending=()):
+        # Verarbeitet die Nachrichten eines verbundenen Spielers bis zum Ende der Verbindung. pending sind bereits
+        # empfangene Nachrichten (z.B. die, die zusammen mit dem JOIN der Lobby ankamen).
+        handler = asyncio.current_task()
+        self.handlers.add(handler)
+        messages = list(pending)
+        try:
+            while True:
+                metrics.count("messages_received", len(messages))
+                for message in messages:
+                    if message.type == protocol.MARK:
+                        self.state.record_mark(player_id, message.payload, message.seq)
+                    elif message.type == protocol.ACK:
+                        self.state.record_ack(player_id, message.seq)
+                    elif message.type == protocol.WIN:
+                        self.declare_winner(player_id + 1)
+                # Wartet ohne Polling auf die nächsten Nachrichten des Spielers.
+                messages = await protocol.read_messages(reader, decoder)
+        except (ConnectionError, ValueError):
+            pass  # Verbindung geschlossen oder ungültige Daten empfangen.
+        finally:
+            if self.writers.get(player_id) is writer:
+                del self.writers[player_id]  # Eine neuere Verbindung desselben Spielers bleibt bestehen.
+            self.handlers.discard(handler)
+            writer.close()
+
+    def declare_winner(self, player_id):
+        self.state.declare_winner(player_id)  # Nur die erste WIN-Meldung zählt.
+
+    def on_state_change(self, event, round_count, payload):
+        # Listener des Spielzustands; läuft im Event-Loop, da alle Änderungen dort passieren.
+        if event == "win":
+            self.winner_event.set()
+            self.round_event.set()
+        elif event in ("mark", "ack") and self.state.all_acknowledged():
+            self.round_event.set()
+
+    async def broadcast(self, data):
+        # Schreibt die Nachricht in alle Puffer und wartet danach gemeinsam auf das Leeren der Puffer.
+        started = time.perf_counter()
+        writers = list(self.writers.values())
+        for writer in writers:
+            writer.write(data)
+        await asyncio.gather(*(writer.drain() for writer in writers), return_exceptions=True)
+        metrics.observe("broadcast", time.perf_counter() - started)
+        metrics.count("messages_sent", len(writers))
+
+    async def play(self):
+        await self.all_connected.wait()
+        self.log("Start des Spiels")
+
+        while not self.winner:
+            drawn_word = self.scheduler.draw()
+            if drawn_word is None:
+                break  # Alle Wörter wurden gezogen, ohne dass jemand gewonnen hat.
+            self.round_event.clear()
+            self.state.start_round(drawn_word)
+            self.log(f"Runde {self.round_count}: Das gezogene Wort lautet: {drawn_word}")
+            await self.broadcast(protocol.encode_message(protocol.DRAW, self.round_count, drawn_word))
+
+            # Die Runde endet nach Ablauf der Zeit oder sofort, wenn alle Spieler geantwortet haben
+            # oder eine WIN-Meldung eintrifft.
+            await self.wait_event(self.round_event, self.timing.round_seconds)
+            if self.logger is not None:
+                await asyncio.to_thread(self.logger.flush)  # Schreibt die Einträge der Runde auf die Platte.
+            if self.winner:
+                break
+            await self.wait_event(self.winner_event, self.timing.pause_seconds)  # Pause, endet bei einem Sieg.
+
+        winner_name = self.player_names[self.winner - 1] if self.winner else ""
+        await self.broadcast(protocol.encode_message(protocol.WIN, self.round_count, winner_name))
+        if self.winner:
+            self.log(f"{winner_name} hat gewonnen!", self.winner)
+        self.log("Ende des Spiels")
+        return self.winner
+
+    @staticmethod
+    async def wait_event(event, timeout):
+        # Wartet höchstens timeout Sekunden auf das Ereignis; gibt zurück, ob es eingetreten ist.
+        if event.is_set():
+            return True
+        if timeout <= 0:
+            return False
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self):
+        for writer in list(self.writers.values()):
+            writer.close()  # Die Verbindungs-Tasks erhalten dadurch EOF und beenden sich selbst.
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def run(self):
+        await self.start()
+        try:
+            return await self.play()
+        finally:
+            await self.close()
+
+
+def run_async_server(num_players, words, server_ip, server_port, player_names, log_format="text", card_size=None,
+                     timing=RoundTiming()):
+    # Einstiegspunkt für `--server-mode asyncio`; ersetzt master_process samt handle_player_connection.
+    metrics.start("Master", serve_http=True)
+    with GameLogger(log_file_name("Master", log_format), log_format) as logger:
+        server = AsyncBingoServer(num_players, words, player_names, server_ip, server_port, timing=timing,
+                                  logger=logger, card_size=card_size)
+        print(f"Master (asyncio): Warte auf {num_players} Spieler an {server_ip}:{server_port} ...")
+        try:
+            winner_id = asyncio.run(server.run())
+        except KeyboardInterrupt:
+            logger.log("Abbruch")
+            print("Das Spiel wurde vom Benutzer abgebrochen.")
+            return
+        finally:
+            metrics.stop()
+    if winner_id:
+        print(f"{player_names[winner_id - 1]} hat gewonnen!")
+        time.sleep(300)  # Wartet wie master_process 5 Minuten, bevor das Programm beendet wird.
+    else:
+        print("Alle Wörter wurden gezogen, es gibt keinen Gewinner.")
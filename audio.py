@@ -0,0 +1,77 @@
+import os
+
+# Soundeffekte des Spiels. Die WAV-Dateien werden erst beim ersten Abspielen dekodiert und danach zwischengespeichert.
+SOUND_FILES = {
+    "sound1": "sound1.wav",
+    "countdown": "countdown.wav",
+    "achievement": "achievement.wav",
+    "winning": "winning.wav",
+}
+SOUND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_enabled = os.environ.get("BINGO_NO_AUDIO", "") == ""  # Mit BINGO_NO_AUDIO=1 bleibt der Ton aus.
+_mixer = None  # pygame.mixer, sobald er erfolgreich initialisiert wurde.
+_sounds = {}  # Name -> dekodierter Sound (oder None, wenn die Datei nicht geladen werden konnte).
+
+
+def disable():
+    # Schaltet den Ton vollständig ab (z.B. für `--no-audio`, Server und Simulationen). Über die Umgebung gilt das
+    # auch für später gestartete Prozesse, die das Modul neu importieren (Startmethode spawn unter Windows/macOS).
+    global _enabled
+    _enabled = False
+    os.environ["BINGO_NO_AUDIO"] = "1"
+
+
+def is_enabled():
+    return _enabled
+
+
+def _init_mixer():
+    # Importiert pygame und initialisiert den Mixer erst bei Bedarf.
+    # Ohne pygame oder ohne Audiogerät wird der Ton automatisch abgeschaltet.
+    global _mixer
+    if _mixer is not None:
+        return _mixer
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    try:
+        import pygame
+    except ImportError:
+        disable()
+        return None
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        disable()  # Kein Audiogerät vorhanden.
+        return None
+    _mixer = pygame.mixer
+    return _mixer
+
+
+def load(name):
+    # Liefert den dekodierten Sound aus dem Zwischenspeicher und lädt ihn beim ersten Zugriff.
+    if name in _sounds:
+        return _sounds[name]
+    mixer = _init_mixer() if _enabled else None
+    if mixer is None:
+        return None
+    try:
+        sound = mixer.Sound(os.path.join(SOUND_DIR, SOUND_FILES[name]))
+    except Exception:  # pygame meldet fehlende oder defekte Dateien als pygame.error.
+        sound = None  # Das Spiel läuft ohne diesen Sound weiter.
+    _sounds[name] = sound
+    return sound
+
+
+def preload(*names):
+    # Dekodiert die angegebenen Sounds (Standard: alle) vorab, z.B. bevor eine Runde beginnt.
+    for name in names or SOUND_FILES:
+        load(name)
+
+
+def play(name):
+    # Spielt einen Sound ab; bei abgeschaltetem Ton passiert nichts.
+    if not _enabled:
+        return
+    sound = load(name)
+    if sound is not None:
+        sound.play()
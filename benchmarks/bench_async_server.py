@@ -0,0 +1,73 @@
+# Lastbenchmark für den asyncio-Server: verbindet N simulierte Spieler und misst
+# die Annahmelatenz sowie die Fan-out-Zeit einer Ziehung an alle Spieler.
+#
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.bench_async_server --clients 500 --rounds 20
+import argparse
+import asyncio
+import statistics
+import time
+
+import protocol
+from async_server import AsyncBingoServer
+from scheduler import RoundTiming
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_benchmark(num_clients, rounds):
+    words = [f"Wort{i}" for i in range(max(rounds, 1))]
+    player_names = [f"Bot{i + 1}" for i in range(num_clients)]
+    server = AsyncBingoServer(num_clients, words, player_names, '127.0.0.1', 0, timing=RoundTiming(0, 0))
+    await server.start()
+
+    # Annahmelatenz: Zeit vom Verbindungsaufbau bis zum erfolgreichen connect() pro Client.
+    connect_times = []
+
+    async def connect(name):
+        started = time.perf_counter()
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.server_port)
+        connect_times.append(time.perf_counter() - started)
+        writer.write(protocol.encode_join(None, name))
+        return reader, writer
+
+    started = time.perf_counter()
+    clients = await asyncio.gather(*(connect(name) for name in player_names))
+    await server.all_connected.wait()
+    all_accepted = time.perf_counter() - started
+
+    # Fan-out: Zeit vom Beginn der Übertragung bis alle Clients das Wort empfangen haben.
+    fanout_times = []
+    for seq, word in enumerate(words[:rounds], start=1):
+        data = protocol.encode_message(protocol.DRAW, seq, word)
+        reads = [asyncio.ensure_future(reader.readexactly(len(data))) for reader, _ in clients]
+        started = time.perf_counter()
+        await server.broadcast(data)
+        await asyncio.gather(*reads)
+        fanout_times.append(time.perf_counter() - started)
+
+    for _, writer in clients:
+        writer.close()
+    await server.close()
+    return connect_times, all_accepted, fanout_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lastbenchmark für den asyncio-Bingo-Server")
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    for num_clients in args.clients:
+        connect_times, all_accepted, fanout_times = asyncio.run(run_benchmark(num_clients, args.rounds))
+        print(f"{num_clients:5d} Clients | Annahme gesamt {all_accepted * 1000:8.2f} ms"
+              f" | connect p50 {percentile(connect_times, 0.5) * 1000:7.2f} ms"
+              f" p99 {percentile(connect_times, 0.99) * 1000:7.2f} ms"
+              f" | Fan-out Mittel {statistics.mean(fanout_times) * 1000:7.2f} ms"
+              f" max {max(fanout_times) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
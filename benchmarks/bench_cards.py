@@ -0,0 +1,42 @@
+# Benchmark der Kartenerzeugung: Karten pro Sekunde mit CardPool (ein Durchlauf, Wort-IDs, optional
+# eindeutige Karten) im Vergleich zu create_bingo_card pro Spieler.
+#
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.bench_cards --sizes 3 5 7 --count 1000
+import argparse
+import time
+
+from card_pool import CardPool
+from main import BingoCard, create_bingo_card, read_words_from_file
+
+
+def bench(function, count):
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    return count / elapsed, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Karten pro Sekunde bei verschiedenen Kartengrößen")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 5, 7])
+    parser.add_argument("--count", type=int, default=1000, help="Anzahl der Spieler bzw. Karten")
+    parser.add_argument("--words", default="words.txt")
+    args = parser.parse_args()
+
+    words = read_words_from_file(args.words)
+    pool = CardPool(words, seed=1)
+    for size in args.sizes:
+        count = args.count
+        variants = {
+            "create_bingo_card": lambda: [create_bingo_card(pool.words, size) for _ in range(count)],
+            "CardPool (IDs)": lambda: pool.generate(count, size),
+            "CardPool + BingoCard": lambda: [BingoCard(pool.card_rows(card, size))
+                                             for card in pool.generate(count, size)],
+        }
+        for name, function in variants.items():
+            rate, elapsed = bench(function, count)
+            print(f"{size}x{size} {name:22s} | {rate:12,.0f} Karten/s | {count} Karten in {elapsed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
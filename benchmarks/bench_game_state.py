@@ -0,0 +1,85 @@
+# Benchmark des Spielzustands: Zustandsoperationen pro Sekunde und Lock-Konkurrenz für den früheren
+# Manager().dict() mit multiprocessing.Lock (ein Prozess pro Spieler wie handle_player_connection) im
+# Vergleich zu GameState im Serverprozess (ein Thread pro Spieler).
+#
+# Eine Operation entspricht dem, was eine Spielerverbindung pro Nachricht tut: gezogenes Wort und Gewinner
+# lesen und die eigene Markierung schreiben.
+#
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.bench_game_state --players 2 16 128
+import argparse
+import threading
+import time
+from multiprocessing import Manager, Lock, Process, Value
+
+from game_state import GameState
+
+
+def manager_worker(shared_state, lock, player_id, ops, contentions):
+    for _ in range(ops):
+        if not lock.acquire(False):
+            with contentions.get_lock():
+                contentions.value += 1
+            lock.acquire()
+        try:
+            shared_state['drawn_word']
+            shared_state['winner']
+            shared_state[f"player_{player_id}_marked"] = True
+        finally:
+            lock.release()
+
+
+def bench_manager(num_players, ops):
+    manager = Manager()
+    shared_state = manager.dict()
+    shared_state['drawn_word'] = 'Synergie'
+    shared_state['winner'] = 0
+    for i in range(num_players):
+        shared_state[f"player_{i}_marked"] = False
+    lock = Lock()
+    contentions = Value('i', 0)
+    workers = [Process(target=manager_worker, args=(shared_state, lock, i, ops, contentions))
+               for i in range(num_players)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    manager.shutdown()
+    return num_players * ops / elapsed, contentions.value / (num_players * ops)
+
+
+def state_worker(state, player_id, ops):
+    for _ in range(ops):
+        state.drawn_words[-1]
+        state.winner
+        state.record_mark(player_id, 'Synergie')
+
+
+def bench_game_state(num_players, ops):
+    state = GameState(num_players)
+    state.start_round('Synergie')
+    workers = [threading.Thread(target=state_worker, args=(state, i, ops)) for i in range(num_players)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    return num_players * ops / elapsed, state.contentions / (num_players * ops)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zustandsoperationen/s: Manager-Proxy vs. GameState")
+    parser.add_argument("--players", type=int, nargs="+", default=[2, 16, 128])
+    parser.add_argument("--ops", type=int, default=200, help="Operationen pro Spieler")
+    args = parser.parse_args()
+
+    for num_players in args.players:
+        for name, bench in (("Manager+Lock", bench_manager), ("GameState", bench_game_state)):
+            rate, contention = bench(num_players, args.ops)
+            print(f"{num_players:4d} Spieler {name:13s} | {rate:12,.0f} Ops/s | Lock belegt bei {contention * 100:6.2f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# Lasttest: startet einen Server (asyncio-Server oder Lobby) in einem eigenen Prozess und spielt mit Bots aus
+# bots.py dagegen. Berichtet Durchsatz (Nachrichten und Runden pro Sekunde), Perzentile der Antwortzeit und der
+# Sendedauer an alle Spieler (Metriken des Servers, siehe metrics.py), Server-CPU sowie die Zeit bis zum Gewinner.
+# master_process braucht ein curses-Terminal und ist hier daher nicht dabei.
+#
+# Aufruf aus dem Projektverzeichnis:
+#   python -m benchmarks.bench_load --bots 50 500 2000 --delay 0 0.05 --error-rate 0.05
+#   python -m benchmarks.bench_load --mode lobby --room-size 10 --bots 1000
+import argparse
+import asyncio
+import resource
+import statistics
+import time
+from multiprocessing import Pipe, Process
+
+import metrics
+from async_server import AsyncBingoServer
+from bots import make_bots, raise_file_limit, run_bots
+from card_pool import normalize_words
+from lobby import BingoLobby
+from main import read_words_from_file
+from scheduler import RoundTiming
+
+
+def load_server(connection, mode, num_bots, room_size, words, card_size, timing):
+    # Läuft im eigenen Prozess; liefert den Port und am Ende Metriken, CPU-Zeit und Ergebnisse zurück.
+    raise_file_limit(num_bots + 64)
+    metrics.enable()
+
+    async def serve():
+        if mode == "lobby":
+            server = BingoLobby(words, '127.0.0.1', 0, room_size, card_size=card_size, timing=timing,
+                                max_games=-(-num_bots // room_size))
+            await server.start()
+            connection.send(server.server_port)
+            try:
+                await server.done.wait()
+            finally:
+                await server.close()
+            return [rounds for _, _, rounds in server.results]
+        player_names = [f"Bot{i + 1}" for i in range(num_bots)]
+        server = AsyncBingoServer(num_bots, words, player_names, '127.0.0.1', 0, timing=timing, card_size=card_size)
+        await server.start()
+        connection.send(server.server_port)
+        try:
+            await server.play()
+        finally:
+            await server.close()
+        return [server.round_count]
+
+    rounds = asyncio.run(serve())
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    connection.send((metrics.snapshot(), usage.ru_utime + usage.ru_stime, rounds))
+
+
+def run_load(mode, num_bots, room_size, words, card_size, timing, min_delay, max_delay, error_rate, seed):
+    parent, child = Pipe()
+    server = Process(target=load_server, args=(child, mode, num_bots, room_size, words, card_size, timing))
+    server.start()
+    server_port = parent.recv()
+
+    bots = make_bots(num_bots, words, card_size, min_delay, max_delay, error_rate,
+                     room_size if mode == "lobby" else None, "raum" if mode == "lobby" else None, seed)
+    started = time.perf_counter()
+    errors = asyncio.run(run_bots(bots, '127.0.0.1', server_port))
+    elapsed = time.perf_counter() - started
+    snapshot, server_cpu, rounds = parent.recv()
+    server.join()
+    return bots, errors, elapsed, snapshot, server_cpu, rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lasttest des Bingo-Servers mit Bots")
+    parser.add_argument("--mode", choices=["asyncio", "lobby"], default="asyncio")
+    parser.add_argument("--bots", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--room-size", type=int, default=10, help="Spieler pro Raum im Lobby-Modus")
+    parser.add_argument("--size", type=int, default=5)
+    parser.add_argument("--delay", type=float, nargs=2, default=[0.0, 0.05], metavar=("MIN", "MAX"))
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--round-seconds", type=float, default=5)
+    parser.add_argument("--words", default="words.txt")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    raise_file_limit(max(args.bots) + 64)
+    words = normalize_words(read_words_from_file(args.words))
+    timing = RoundTiming(args.round_seconds, 0)
+    for num_bots in args.bots:
+        bots, errors, elapsed, snapshot, server_cpu, rounds = run_load(
+            args.mode, num_bots, args.room_size, words, args.size, timing, args.delay[0], args.delay[1],
+            args.error_rate, args.seed)
+        messages = sum(bot.messages_sent + bot.messages_received for bot in bots)
+        # Zeit bis zum Gewinner aus Sicht der Bots: erste Ziehung bis zur WIN-Nachricht, pro Spiel bzw. Raum.
+        games = {}
+        for bot in bots:
+            if bot.first_draw_at is not None and bot.finished_at is not None:
+                games.setdefault(bot.room, []).append(bot.finished_at - bot.first_draw_at)
+        to_winner = [max(times) for times in games.values()]
+        winners = sum(1 for bot in bots if bot.claimed)
+        histograms = snapshot["histograms"]
+        round_trip = histograms.get("round_trip", {})
+        broadcast = histograms.get("broadcast", {})
+        print(f"{num_bots:5d} Bots ({args.mode}) | {len(games)} Spiele, {sum(rounds)} Runden, {winners} Bingo-Meldungen"
+              f" | {messages / elapsed:9.0f} Nachrichten/s, {sum(rounds) / elapsed:7.1f} Runden/s"
+              f" | Server-CPU {server_cpu:6.2f} s" + (f" | {len(errors)} Verbindungsfehler" if errors else ""))
+        if round_trip:
+            print(f"      Antwortzeit p50 {round_trip['p50'] * 1000:7.2f} ms p90 {round_trip['p90'] * 1000:7.2f} ms"
+                  f" p99 {round_trip['p99'] * 1000:7.2f} ms"
+                  f" | Senden an alle p50 {broadcast['p50'] * 1000:7.2f} ms p99 {broadcast['p99'] * 1000:7.2f} ms")
+        if to_winner:
+            print(f"      Zeit bis zum Gewinner Mittel {statistics.mean(to_winner):6.2f} s"
+                  f" max {max(to_winner):6.2f} s, Runden Mittel {statistics.mean(rounds):6.1f}")
+
+
+if __name__ == "__main__":
+    main()
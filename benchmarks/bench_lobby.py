@@ -0,0 +1,106 @@
+# Skalierungsbenchmark der Lobby: R Räume mit je P Spielern laufen gleichzeitig in einem Serverprozess.
+# Die Spieler (asyncio-Clients im Benchmarkprozess) beantworten jede Ziehung sofort mit ACK, sodass die Runden
+# ohne Wartezeit enden. Gemessen werden Beitrittsdauer, Spieldauer, Runden pro Sekunde über alle Räume sowie
+# CPU-Zeit und Speicherzuwachs (Spitzenwert RSS) des Serverprozesses.
+#
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.bench_lobby --rooms 1 10 50 --players 2 10 --words 200
+import argparse
+import asyncio
+import resource
+import time
+from multiprocessing import Pipe, Process
+
+import protocol
+from lobby import BingoLobby
+from scheduler import RoundTiming
+
+
+def lobby_server(connection, num_players, num_rooms, num_words, card_size):
+    # Läuft im eigenen Prozess, damit CPU-Zeit und Speicher nur dem Server zugerechnet werden.
+    async def serve():
+        words = [f"Wort{i}" for i in range(num_words)]
+        lobby = BingoLobby(words, '127.0.0.1', 0, num_players, card_size=card_size, timing=RoundTiming(30, 0),
+                           max_games=num_rooms)
+        await lobby.start()
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        connection.send(lobby.server_port)
+        try:
+            await lobby.done.wait()
+        finally:
+            await lobby.close()
+        return usage, sum(rounds for _, _, rounds in lobby.results)
+
+    before, rounds = asyncio.run(serve())
+    after = resource.getrusage(resource.RUSAGE_SELF)
+    cpu = (after.ru_utime + after.ru_stime) - (before.ru_utime + before.ru_stime)
+    connection.send((cpu, (after.ru_maxrss - before.ru_maxrss) / 1024, rounds))  # ru_maxrss ist in KiB.
+
+
+async def instant_player(server_port, room, name, joined):
+    reader, writer = await asyncio.open_connection('127.0.0.1', server_port)
+    writer.write(protocol.encode_join(room, name))
+    decoder = protocol.FrameDecoder()
+    try:
+        while True:
+            for message in await protocol.read_messages(reader, decoder):
+                if message.type == protocol.STATE:
+                    joined()
+                elif message.type == protocol.DRAW:
+                    writer.write(protocol.encode_message(protocol.ACK, message.seq))
+                elif message.type == protocol.WIN:
+                    return
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_players(server_port, num_rooms, num_players):
+    pending = num_rooms * num_players
+    all_joined = asyncio.Event()
+    started = time.perf_counter()
+
+    def joined():
+        nonlocal pending
+        pending -= 1
+        if not pending:
+            all_joined.set()
+
+    players = [asyncio.ensure_future(instant_player(server_port, f"raum{room}", f"Bot{player}", joined))
+               for room in range(num_rooms) for player in range(num_players)]
+    await all_joined.wait()
+    join_time = time.perf_counter() - started
+    await asyncio.gather(*players)
+    return join_time, time.perf_counter() - started - join_time
+
+
+def run_benchmark(num_rooms, num_players, num_words, card_size):
+    parent, child = Pipe()
+    server = Process(target=lobby_server, args=(child, num_players, num_rooms, num_words, card_size))
+    server.start()
+    server_port = parent.recv()
+    join_time, game_time = asyncio.run(run_players(server_port, num_rooms, num_players))
+    cpu, memory, rounds = parent.recv()
+    server.join()
+    return join_time, game_time, cpu, memory, rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skalierungsbenchmark der Lobby (Räume x Spieler)")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--players", type=int, nargs="+", default=[2, 10])
+    parser.add_argument("--words", type=int, default=200, help="Vokabular und damit Runden pro Raum")
+    parser.add_argument("--size", type=int, default=5)
+    args = parser.parse_args()
+
+    for num_rooms in args.rooms:
+        for num_players in args.players:
+            join_time, game_time, cpu, memory, rounds = run_benchmark(num_rooms, num_players, args.words, args.size)
+            print(f"{num_rooms:4d} Räume x {num_players:4d} Spieler | Beitritt {join_time * 1000:8.1f} ms"
+                  f" | Spiele {game_time:6.2f} s, {rounds / game_time:8.1f} Runden/s"
+                  f" | Server-CPU {cpu:6.2f} s ({cpu / max(rounds, 1) * 1e6:6.1f} µs/Runde)"
+                  f" | RSS +{memory:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
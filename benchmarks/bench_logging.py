@@ -0,0 +1,49 @@
+# Mikrobenchmark für das Spiel-Log: Ereignisse pro Sekunde mit log_event (Datei pro Ereignis öffnen,
+# schreiben, schließen) im Vergleich zum gepufferten GameLogger im Text- und JSON-Format.
+#
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.bench_logging --events 50000
+import argparse
+import os
+import tempfile
+import time
+
+from game_log import GameLogger
+from main import log_event
+
+
+def bench_log_event(log_file, num_events):
+    started = time.perf_counter()
+    for i in range(num_events):
+        log_event(log_file, f"Synergie ({i % 5},{i % 7})")
+    return num_events / (time.perf_counter() - started)
+
+
+def bench_game_logger(log_file, num_events, log_format, round_size):
+    started = time.perf_counter()
+    with GameLogger(log_file, log_format) as logger:
+        for i in range(num_events):
+            logger.log(f"Synergie ({i % 5},{i % 7})", i // round_size, i % 12 + 1, (i % 7, i % 5))
+            if i % round_size == round_size - 1:
+                logger.flush()  # Wie im Spiel: Flush am Rundenende.
+    return num_events / (time.perf_counter() - started)  # Enthält das Schreiben aller Einträge beim Schließen.
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mikrobenchmark für log_event und GameLogger")
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--round-size", type=int, default=100, help="Ereignisse pro Runde bis zum nächsten flush()")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = {
+            "log_event": bench_log_event(os.path.join(directory, "log_event.txt"), args.events),
+            "GameLogger text": bench_game_logger(os.path.join(directory, "text.txt"), args.events, "text", args.round_size),
+            "GameLogger json": bench_game_logger(os.path.join(directory, "json.jsonl"), args.events, "json", args.round_size),
+        }
+    baseline = results["log_event"]
+    for name, rate in results.items():
+        print(f"{name:16s} | {rate:12,.0f} Ereignisse/s | {rate / baseline:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# Mikrobenchmark der Metriken: Kosten von metrics.timer() und metrics.count() pro Aufruf, ausgeschaltet (Standard
+# im Spiel) und eingeschaltet, damit die Messpunkte in den heißen Schleifen die Messung nicht selbst verfälschen.
+#
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.bench_metrics --calls 1000000
+import argparse
+import time
+
+import metrics
+
+
+def bench(calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        with metrics.timer("render"):
+            pass
+    timer_cost = (time.perf_counter() - started) / calls
+    started = time.perf_counter()
+    for _ in range(calls):
+        metrics.count("recv_would_block")
+    count_cost = (time.perf_counter() - started) / calls
+    return timer_cost, count_cost
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mikrobenchmark der Metriken")
+    parser.add_argument("--calls", type=int, default=1000000)
+    args = parser.parse_args()
+
+    for label, enabled in (("aus", False), ("ein", True)):
+        if enabled:
+            metrics.enable()
+        timer_cost, count_cost = bench(args.calls)
+        print(f"Metriken {label} | timer() {timer_cost * 1e9:7.1f} ns | count() {count_cost * 1e9:7.1f} ns")
+    print(metrics.format_text(), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Durchsatzbenchmark für das Protokoll: Nachrichten pro Sekunde beim Kodieren/Dekodieren
+# im Speicher und über eine Loopback-TCP-Verbindung, jeweils mit verschiedenen Batchgrößen.
+#
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.bench_protocol --messages 200000
+import argparse
+import socket
+import threading
+import time
+
+import protocol
+
+PAYLOAD = "Wertschöpfend"  # Enthält bewusst einen Umlaut (Mehrbyte-Zeichen).
+
+
+def bench_codec(num_messages, batch_size):
+    batch = [(protocol.DRAW, seq, PAYLOAD) for seq in range(batch_size)]
+    decoder = protocol.FrameDecoder()
+    started = time.perf_counter()
+    for _ in range(num_messages // batch_size):
+        decoder.feed(protocol.encode_batch(batch))
+    return (num_messages // batch_size) * batch_size / (time.perf_counter() - started)
+
+
+def bench_loopback(num_messages, batch_size):
+    server = socket.create_server(('127.0.0.1', 0))
+    port = server.getsockname()[1]
+    batches = num_messages // batch_size
+    expected = batches * batch_size
+    received = [0]
+
+    def receive():
+        conn, _ = server.accept()
+        decoder = protocol.FrameDecoder()
+        with conn:
+            while received[0] < expected:
+                received[0] += len(protocol.recv_messages(conn, decoder))
+
+    receiver = threading.Thread(target=receive)
+    receiver.start()
+    with socket.create_connection(('127.0.0.1', port)) as sender:
+        sender.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        batch = [(protocol.DRAW, seq, PAYLOAD) for seq in range(batch_size)]
+        started = time.perf_counter()
+        for _ in range(batches):
+            protocol.send_messages(sender, batch)  # Ein Systemaufruf pro Batch.
+        receiver.join()
+        elapsed = time.perf_counter() - started
+    server.close()
+    return expected / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Durchsatzbenchmark für protocol.py")
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 256])
+    args = parser.parse_args()
+
+    for batch_size in args.batch_sizes:
+        codec_rate = bench_codec(args.messages, batch_size)
+        loopback_rate = bench_loopback(args.messages, batch_size)
+        print(f"Batch {batch_size:4d} | Kodieren+Dekodieren {codec_rate:12,.0f} Nachr./s"
+              f" | Loopback-TCP {loopback_rate:12,.0f} Nachr./s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Render-Kosten-Benchmark: addstr-Aufrufe und geschriebene Bytes pro Frame für das vollständige Neuzeichnen
+# (wie display_bingo_card) und für das differenzielle Zeichnen mit CardRenderer. Gespielt wird ein typischer
+# Ablauf aus Leerlauf-Frames (100-ms-Takt), Cursorbewegungen und Markierungen.
+#
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.bench_render --sizes 5 15 25
+import argparse
+import random
+import time
+
+from main import create_bingo_card, mark_word_on_card
+from renderer import CardRenderer
+
+
+class CountingWindow:
+    # Nimmt Zeichenbefehle entgegen, ohne ein Terminal zu benötigen; die Kosten zählt der Renderer.
+    def addstr(self, *args):
+        pass
+
+    def move(self, y, x):
+        pass
+
+    def clrtoeol(self):
+        pass
+
+    def noutrefresh(self):
+        pass
+
+
+def play_frames(size, frames, differential, seed=1):
+    rng = random.Random(seed)
+    card = create_bingo_card([f"Wort{i}" for i in range(size * size)], size)
+    renderer = CardRenderer(CountingWindow(), size, 2, 0, color_pair=lambda pair: pair, doupdate=lambda: None)
+    cursor_y = cursor_x = 0
+    started = time.perf_counter()
+    for frame in range(frames):
+        action = rng.random()
+        if action < 0.2:  # Cursorbewegung
+            cursor_y = min(size - 1, max(0, cursor_y + rng.choice((-1, 1))))
+        elif action < 0.25:  # Markierung
+            mark_word_on_card(card, rng.randrange(size), rng.randrange(size))
+        if not differential:
+            renderer.invalidate()  # Vollständiges Neuzeichnen in jedem Frame wie bisher.
+        renderer.render(card, cursor_y, cursor_x)
+    elapsed = time.perf_counter() - started
+    return renderer.addstr_calls / frames, renderer.bytes_written / frames, elapsed / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render-Kosten pro Frame: vollständig vs. differenziell")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 15, 25])
+    parser.add_argument("--frames", type=int, default=5000)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        for name, differential in (("vollständig", False), ("differenziell", True)):
+            calls, written, seconds = play_frames(size, args.frames, differential)
+            print(f"{size:3d}x{size:<3d} {name:13s} | {calls:8.2f} addstr/Frame | {written:10.1f} Bytes/Frame"
+                  f" | {seconds * 1e6:8.1f} µs/Frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Benchmark der Wiedergabe: schreibt mit GameLogger Spieler-Logs simulierter Partien (wie player_process) und misst
+# die Nachprüfung der Siege in Logs pro Sekunde sowie den Sprung zu Runde K über den Rundenindex im Vergleich zum
+# vollständigen Durchlauf.
+#
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.bench_replay --games 2000 --size 5 --words 400
+import argparse
+import glob
+import json
+import os
+import tempfile
+import time
+
+from card_pool import CardPool
+from game_log import GameLogger
+from main import BingoCard
+from replay import GameReplay, ReplayState, read_entries, verify_logs
+from scheduler import DrawScheduler
+
+
+def write_game(log_file, log_format, words, size, seed):
+    # Eine Partie aus Sicht eines Spielers: Ziehungen bis zum Bingo bzw. bis alle Wörter gezogen sind.
+    pool = CardPool(words, seed)
+    card = BingoCard(pool.card_rows(pool.generate(1, size)[0], size))
+    scheduler = DrawScheduler(words, seed)
+    with GameLogger(log_file, log_format) as logger:
+        logger.log("Start des Spiels", player=1)
+        logger.log(f"Größe des Spielfelds: ({size}x{size})", player=1)
+        logger.log(f"Karte von Bot: {json.dumps(card.cells, ensure_ascii=False)}", player=1)
+        round_count = 0
+        while (word := scheduler.draw()) is not None:
+            round_count += 1
+            logger.log(f"Runde {round_count}: Das gezogene Wort lautet: {word}", round_count, 1)
+            position = card.find(word)
+            if position is not None:
+                card.mark(*position)
+                logger.log(f"{word} ({position[1]},{position[0]})", round_count, 1, position)
+                if card.has_bingo():
+                    logger.log("Sieg", round_count, 1)
+                    break
+        logger.log("Ende des Spiels", round_count, 1)
+    return round_count
+
+
+def full_scan(path, round_count):
+    state = ReplayState()
+    for _, entry in read_entries(path):
+        if entry.kind == "draw" and entry.round > round_count:
+            break
+        state.apply(entry)
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Wiedergabe aufgezeichneter Partien")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=5)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    words = [f"Wort{i}" for i in range(args.words)]
+    with tempfile.TemporaryDirectory() as directory:
+        for log_format, extension in (("text", "txt"), ("json", "jsonl")):
+            for game in range(args.games):
+                write_game(os.path.join(directory, f"{game}.{extension}"), log_format, words, args.size, game)
+            paths = sorted(glob.glob(os.path.join(directory, f"*.{extension}")))
+            megabytes = sum(os.path.getsize(path) for path in paths) / 1e6
+
+            for workers in (1, args.workers):
+                started = time.perf_counter()
+                results = verify_logs(paths, workers)
+                elapsed = time.perf_counter() - started
+                verified = sum(result["verified"] for result in results)
+                print(f"{log_format:<4} | {len(paths)} Logs ({megabytes:.1f} MB), Prozesse {workers or 'alle'}"
+                      f" | {len(paths) / elapsed:8.0f} Logs/s, {megabytes / elapsed:6.1f} MB/s"
+                      f" | {verified} Siege bestätigt")
+
+            # Sprung an das Ende des längsten Logs: vollständiger Durchlauf gegen Index.
+            path = max(paths, key=os.path.getsize)
+            replay = GameReplay(path)
+            started = time.perf_counter()
+            replay.build_index()
+            index_time = time.perf_counter() - started
+            target = len(replay.offsets)
+            started = time.perf_counter()
+            for _ in range(100):
+                expected = full_scan(path, target)
+            scan_time = (time.perf_counter() - started) / 100
+            started = time.perf_counter()
+            for _ in range(100):
+                state = replay.state_at(target)
+            jump_time = (time.perf_counter() - started) / 100
+            assert state.checkpoint() == expected.checkpoint()
+            print(f"{log_format:<4} | Runde {target}: Durchlauf {scan_time * 1000:7.3f} ms"
+                  f" | Index {jump_time * 1000:7.3f} ms (Aufbau einmalig {index_time * 1000:7.3f} ms)")
+
+
+if __name__ == "__main__":
+    main()
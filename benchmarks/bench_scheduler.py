@@ -0,0 +1,85 @@
+# Benchmark der Rundensteuerung: Runden pro Sekunde mit simulierten Spielern, die jede Ziehung sofort
+# beantworten (die Runde endet dadurch vor Ablauf von round_seconds), sowie die Kosten einer Ziehung mit
+# DrawScheduler im Vergleich zur früheren random.choice-Schleife, die bereits gezogene Wörter neu würfelt.
+#
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.bench_scheduler --players 10 100 --words 2000
+import argparse
+import asyncio
+import random
+import time
+
+import protocol
+from async_server import AsyncBingoServer
+from scheduler import DrawScheduler, RoundTiming
+
+
+def draw_with_retries(words, count):
+    # Früheres Verfahren: zufällig ziehen, bis ein noch nicht gezogenes Wort getroffen wird.
+    drawn = set()
+    for _ in range(count):
+        word = random.choice(words)
+        while word in drawn:
+            word = random.choice(words)
+        drawn.add(word)
+
+
+def draw_with_scheduler(words, count):
+    scheduler = DrawScheduler(words)
+    for _ in range(count):
+        scheduler.draw()
+
+
+async def instant_player(server_port, name):
+    # Antwortet auf jede Ziehung sofort mit ACK und beendet sich beim WIN des Servers.
+    reader, writer = await asyncio.open_connection('127.0.0.1', server_port)
+    writer.write(protocol.encode_join(None, name))
+    decoder = protocol.FrameDecoder()
+    try:
+        while True:
+            for message in await protocol.read_messages(reader, decoder):
+                if message.type == protocol.DRAW:
+                    writer.write(protocol.encode_message(protocol.ACK, message.seq))
+                elif message.type == protocol.WIN:
+                    return
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_rounds(num_players, num_words):
+    words = [f"Wort{i}" for i in range(num_words)]
+    player_names = [f"Bot{i + 1}" for i in range(num_players)]
+    server = AsyncBingoServer(num_players, words, player_names, '127.0.0.1', 0, timing=RoundTiming(30, 0))
+    await server.start()
+    players = [asyncio.ensure_future(instant_player(server.server_port, name)) for name in player_names]
+    await server.all_connected.wait()
+    started = time.perf_counter()
+    await server.play()
+    elapsed = time.perf_counter() - started
+    await asyncio.gather(*players)
+    await server.close()
+    return server.round_count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Rundensteuerung")
+    parser.add_argument("--players", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--words", type=int, default=2000)
+    args = parser.parse_args()
+
+    words = [f"Wort{i}" for i in range(args.words)]
+    for name, draw in (("random.choice-Schleife", draw_with_retries), ("DrawScheduler", draw_with_scheduler)):
+        started = time.perf_counter()
+        draw(words, len(words))
+        elapsed = time.perf_counter() - started
+        print(f"{name:<22} | {len(words)} Ziehungen {elapsed * 1000:8.2f} ms"
+              f" | {elapsed / len(words) * 1e6:7.2f} µs pro Ziehung")
+
+    for num_players in args.players:
+        rounds, elapsed = asyncio.run(run_rounds(num_players, args.words))
+        print(f"{num_players:5d} Spieler | {rounds} Runden in {elapsed:6.2f} s | {rounds / elapsed:8.1f} Runden/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Startzeit-Benchmark: misst den kalten Import von main.py in frischen Interpreter-Prozessen.
+# "eager" bildet das frühere Verhalten nach (Mixer initialisieren und alle vier WAV-Dateien beim Import
+# dekodieren), "lazy" ist der heutige Import, bei dem Sounds erst beim ersten Abspielen geladen werden.
+#
+# Aufruf aus dem Projektverzeichnis:  python -m benchmarks.bench_startup --runs 10
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VARIANTS = {
+    "eager (vorher)": "import main, audio; audio.preload()",
+    "lazy (jetzt)": "import main",
+    "lazy --no-audio": "import audio; audio.disable(); import main",
+}
+
+TIMER = "import time; _t = time.perf_counter(); {code}; print(time.perf_counter() - _t)"
+
+
+def measure(code, runs):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", TIMER.format(code=code)], cwd=PROJECT_DIR,
+                                capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startzeit-Benchmark für den Import von main.py")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    try:
+        import pygame  # noqa: F401
+    except ImportError:
+        print("Hinweis: pygame ist nicht installiert, die eager-Variante lädt daher keine Sounds.")
+
+    for name, code in VARIANTS.items():
+        timings = measure(code, args.runs)
+        print(f"{name:16s} | Median {statistics.median(timings) * 1000:8.2f} ms"
+              f" | Min {min(timings) * 1000:8.2f} ms | Max {max(timings) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
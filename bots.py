@@ -0,0 +1,178 @@
+# Bot-Spieler: sprechen dasselbe Protokoll wie player_process, markieren gezogene Wörter aber selbstständig mit
+# check_word_on_card, mark_word_on_card und check_winner. Reaktionszeit und Fehlerquote (übersehene Wörter) sind
+# einstellbar. Alle Bots laufen in einem Event-Loop, sodass ein Prozess Tausende Spieler stellen kann.
+#
+# Aufruf:  python bots.py --bots 50 --port 65432 --delay 0.2 1.5 --error-rate 0.05
+#          python bots.py --bots 200 --room turnier --port 65432      (Lobby, siehe lobby.py)
+# Lasttest mit eigenem Server: python -m benchmarks.bench_load
+import argparse
+import asyncio
+import random
+import resource
+import time
+
+import protocol
+from card_pool import normalize_words
+from main import (BingoCard, check_winner, check_word_on_card, create_bingo_card, mark_word_on_card,
+                  read_words_from_file)
+
+
+class BingoBot:
+    # Ein Spieler ohne Oberfläche. Antworten werden mit loop.call_later() verzögert statt mit einer Task pro
+    # Ziehung, damit auch Tausende Bots mit Reaktionszeit wenig Speicher brauchen.
+    def __init__(self, name, words=None, card_size=5, min_delay=0.0, max_delay=0.0, error_rate=0.0, room=None,
+                 seed=None):
+        self.name = name
+        self.words = words  # Nur nötig, wenn der Server keine Karte zuteilt.
+        self.card_size = card_size
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.error_rate = error_rate  # Wahrscheinlichkeit, ein Wort auf der eigenen Karte zu übersehen.
+        self.room = room  # Mit Raum-ID meldet sich der Bot bei der Lobby an, sonst direkt beim Server.
+        self.random = random.Random(seed)
+
+        self.card = None
+        self.player_id = None
+        self.writer = None
+        self.connected = asyncio.Event()  # Gesetzt, sobald der Verbindungsaufbau erfolgreich oder gescheitert ist.
+        self.done = False
+        self.claimed = False  # Ob dieser Bot Bingo gemeldet hat.
+        self.winner = None  # Vom Server verkündeter Gewinner ("" ohne Gewinner).
+        self.error = None  # Fehlermeldung der Lobby, z.B. voller Raum.
+        self.rounds = 0
+        self.marks = 0
+        self.misses = 0
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.first_draw_at = None  # perf_counter() der ersten Ziehung.
+        self.finished_at = None  # perf_counter() der WIN-Nachricht des Servers.
+
+    async def run(self, server_ip, server_port):
+        try:
+            reader, writer = await asyncio.open_connection(server_ip, server_port)
+        finally:
+            self.connected.set()
+        self.writer = writer
+        writer.write(protocol.encode_join(self.room, self.name))  # Der Server ordnet den Bot über den Namen zu.
+        self.messages_sent += 1
+        decoder = protocol.FrameDecoder()
+        try:
+            while not self.done:
+                for message in await protocol.read_messages(reader, decoder):
+                    self.messages_received += 1
+                    self.handle(message)
+        except (ConnectionError, ValueError):
+            pass  # Server beendet oder ungültige Daten; der Bot hört einfach auf.
+        finally:
+            self.done = True
+            writer.close()
+
+    def handle(self, message):
+        if message.type == protocol.STATE:
+            state = protocol.decode_state(message)
+            if 'error' in state:
+                self.error = state['error']
+                self.done = True
+            if 'card' in state:
+                self.card = BingoCard(state['card'])
+            self.player_id = state.get('player_id', self.player_id)
+        elif message.type == protocol.DRAW:
+            if self.card is None:
+                self.card = create_bingo_card(self.words, self.card_size)  # Server ohne Kartenzuteilung.
+            if self.first_draw_at is None:
+                self.first_draw_at = time.perf_counter()
+            self.rounds = message.seq
+            delay = self.random.uniform(self.min_delay, self.max_delay) if self.max_delay > 0 else 0
+            if delay > 0:
+                asyncio.get_running_loop().call_later(delay, self.answer, message.seq, message.payload)
+            else:
+                self.answer(message.seq, message.payload)
+        elif message.type == protocol.WIN:
+            self.winner = message.payload
+            self.finished_at = time.perf_counter()
+            self.done = True
+
+    def answer(self, seq, word):
+        # Markiert das Wort wie ein Spieler mit Enter bzw. passt wie mit der Leertaste.
+        if self.done or self.claimed:
+            return
+        card = self.card
+        on_card = check_word_on_card(card, word)
+        if on_card and self.random.random() < self.error_rate:
+            self.misses += 1
+            replies = [(protocol.ACK, seq, "")]
+        elif on_card and mark_word_on_card(card, *card.find(word)):
+            self.marks += 1
+            replies = [(protocol.MARK, seq, word)]
+            if check_winner(card, card.size):
+                self.claimed = True
+                replies.append((protocol.WIN, seq, self.name))
+        else:
+            replies = [(protocol.ACK, seq, "")]
+        self.messages_sent += len(replies)
+        self.writer.write(protocol.encode_batch(replies))
+
+
+def raise_file_limit(needed):
+    # Jeder Bot braucht einen Socket; die übliche Grenze von 1024 offenen Dateien reicht dafür oft nicht.
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        new_soft = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+
+
+def make_bots(count, words=None, card_size=5, min_delay=0.0, max_delay=0.0, error_rate=0.0, room_size=None,
+              room_prefix=None, seed=None):
+    # Erzeugt count Bots. Mit room_size werden sie der Reihe nach auf Räume zu je room_size Spielern verteilt.
+    bots = []
+    for i in range(count):
+        room = None
+        if room_prefix is not None:
+            room = f"{room_prefix}{i // room_size}" if room_size else room_prefix
+        bots.append(BingoBot(f"Bot{i + 1}", words, card_size, min_delay, max_delay, error_rate, room,
+                             None if seed is None else seed + i))
+    return bots
+
+
+async def run_bots(bots, server_ip, server_port, connect_batch=200):
+    # Verbindet die Bots in Gruppen (damit der Listen-Backlog des Servers nicht überläuft) und wartet auf alle.
+    # Die nächste Gruppe startet erst, wenn jeder Bot der vorigen verbunden ist oder sein Versuch scheiterte.
+    tasks = []
+    for start in range(0, len(bots), connect_batch):
+        batch = bots[start:start + connect_batch]
+        tasks.extend(asyncio.ensure_future(bot.run(server_ip, server_port)) for bot in batch)
+        await asyncio.gather(*(bot.connected.wait() for bot in batch))
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    return [result for result in results if isinstance(result, Exception)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bot-Spieler für Buzzword Bingo")
+    parser.add_argument("--bots", type=int, default=10)
+    parser.add_argument("--ip", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=65432)
+    parser.add_argument("--size", type=int, default=5, help="Kartengröße, falls der Server keine Karte zuteilt")
+    parser.add_argument("--delay", type=float, nargs=2, default=[0.0, 0.0], metavar=("MIN", "MAX"),
+                        help="Reaktionszeit in Sekunden, gleichverteilt zwischen MIN und MAX")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil übersehener Wörter (0..1)")
+    parser.add_argument("--room", default=None, help="Raum-ID in der Lobby (sonst direkt zum Server)")
+    parser.add_argument("--room-size", type=int, default=None,
+                        help="Verteilt die Bots auf Räume <room>0, <room>1, ... zu je ROOM_SIZE Spielern")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    raise_file_limit(args.bots + 64)
+    words = normalize_words(read_words_from_file("words.txt"))
+    bots = make_bots(args.bots, words, args.size, args.delay[0], args.delay[1], args.error_rate, args.room_size,
+                     args.room, args.seed)
+    errors = asyncio.run(run_bots(bots, args.ip, args.port))
+    for error in errors[:5]:
+        print(f"Verbindungsfehler: {error!r}")
+    winners = sorted({bot.winner for bot in bots if bot.winner})
+    print(f"{len(bots)} Bots, {sum(bot.marks for bot in bots)} Markierungen,"
+          f" {sum(bot.misses for bot in bots)} übersehen")
+    print("Gewinner: " + (", ".join(winners) if winners else "keiner"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import math
+import random
+import sys
+
+
+def normalize_words(words):
+    # Bereinigt die Wortliste einmalig: Leerzeichen am Rand und doppelte Leerzeichen entfernen,
+    # leere Zeilen und Duplikate verwerfen (das erste Vorkommen bleibt) und die Strings internieren.
+    normalized = {}
+    for word in words:
+        word = " ".join(word.split())
+        if word:
+            normalized.setdefault(sys.intern(word), None)
+    return list(normalized)
+
+
+class CardPool:
+    # Kartengenerator für viele Spieler: Das Vokabular wird einmal normalisiert und erhält ganzzahlige
+    # Wort-IDs (Index in self.words). Karten sind Tupel von Wort-IDs, zeilenweise angeordnet.
+    def __init__(self, words, seed=None):
+        self.words = normalize_words(words)
+        self.ids = {word: word_id for word_id, word in enumerate(self.words)}
+        self.random = random.Random(seed)
+
+    def generate(self, count, size, unique=True):
+        # Erzeugt count Karten der Größe size x size in einem Durchlauf. Mit unique=True sind keine zwei Karten
+        # identisch (gleiche Wörter an gleichen Positionen).
+        cells = size * size
+        if cells > len(self.words):
+            raise ValueError(f"Zu wenige Wörter ({len(self.words)}) für eine {size}x{size}-Karte.")
+        if unique and count > math.perm(len(self.words), cells):
+            raise ValueError(f"Es gibt keine {count} verschiedenen {size}x{size}-Karten mit {len(self.words)} Wörtern.")
+
+        sample = self.random.sample
+        population = range(len(self.words))
+        cards = []
+        seen = set()
+        while len(cards) < count:
+            card = tuple(sample(population, cells))
+            if unique:
+                if card in seen:
+                    continue  # Sehr selten; einfach neu ziehen.
+                seen.add(card)
+            cards.append(card)
+        return cards
+
+    def card_rows(self, card, size):
+        # Wandelt eine Karte aus Wort-IDs in Zeilen aus Wörtern um (z.B. für BingoCard oder zum Versenden).
+        words = self.words
+        return [[words[word_id] for word_id in card[y * size:(y + 1) * size]] for y in range(size)]
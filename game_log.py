@@ -0,0 +1,116 @@
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+
+import metrics
+
+_FLUSH = object()  # Steuer-Nachricht: Puffer auf die Platte schreiben.
+_STOP = object()  # Steuer-Nachricht: restliche Einträge schreiben und den Schreib-Thread beenden.
+
+LOG_FORMATS = ("text", "json")
+
+
+def log_file_name(role, log_format="text"):
+    # Baut den Dateinamen wie bisher aus Startzeit und Rolle, z.B. "2024-06-01-12-00-00-bingo-Spieler1.txt".
+    extension = "jsonl" if log_format == "json" else "txt"
+    return f"{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}-bingo-{role}.{extension}"
+
+
+class GameLogger:
+    # Gepuffertes Spiel-Log: log() legt Ereignisse nur in eine begrenzte Warteschlange, ein Hintergrund-Thread
+    # schreibt sie gesammelt in die dauerhaft geöffnete Datei. flush() am Rundenende und close() beim Beenden
+    # warten, bis alles geschrieben ist.
+    #
+    # Formate: "text" entspricht log_event ("<Zeitstempel> <Ereignis>"), "json" schreibt eine JSON-Zeile pro
+    # Ereignis mit Runde, Spieler, Feld sowie Wanduhr- und monotonem Zeitstempel.
+    def __init__(self, log_file, log_format="text", max_queue=10000):
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"Unbekanntes Log-Format: {log_format}")
+        self.log_file = log_file
+        self.log_format = log_format
+        self.queue = queue.Queue(maxsize=max_queue)  # Begrenzt; bei Überlauf bremst log() den Aufrufer.
+        self.closed = False
+        self._timestamp_second = None  # Zwischenspeicher für den formatierten Zeitstempel der aktuellen Sekunde.
+        self._timestamp_text = ""
+        self._file = open(log_file, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._writer, name=f"GameLogger({log_file})", daemon=True)
+        self._thread.start()
+
+    def log(self, event, round_count=None, player=None, cell=None):
+        if self.closed:
+            return
+        self.queue.put((time.time(), time.monotonic(), event, round_count, player, cell))
+
+    def flush(self):
+        # Schreibt alle bisher geloggten Ereignisse und wartet darauf, z.B. am Ende einer Runde.
+        if self.closed:
+            return
+        done = threading.Event()
+        self.queue.put((_FLUSH, done))
+        done.wait()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put((_STOP, None))
+        self._thread.join()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _format(self, entry):
+        wall_time, monotonic, event, round_count, player, cell = entry
+        if self.log_format == "json":
+            # Mikrosekunden genügen und halten die JSON-Zeilen kurz.
+            record = {"ts": round(wall_time, 6), "mono": round(monotonic, 6), "event": event}
+            if round_count is not None:
+                record["round"] = round_count
+            if player is not None:
+                record["player"] = player
+            if cell is not None:
+                record["cell"] = list(cell)
+            return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        second = int(wall_time)
+        if second != self._timestamp_second:  # strftime nur einmal pro Sekunde statt pro Ereignis.
+            self._timestamp_second = second
+            self._timestamp_text = datetime.fromtimestamp(second).strftime("%Y-%m-%d-%H-%M-%S")
+        return f"{self._timestamp_text} {event}\n"
+
+    def _writer(self):
+        while True:
+            batch = [self.queue.get()]  # Wartet blockierend auf das nächste Ereignis.
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())  # Sammelt alles, was inzwischen angekommen ist.
+                except queue.Empty:
+                    break
+
+            lines = []
+            waiting = []
+            stop = False
+            for entry in batch:
+                if entry[0] is _FLUSH:
+                    waiting.append(entry[1])
+                elif entry[0] is _STOP:
+                    stop = True
+                else:
+                    lines.append(self._format(entry))
+            if lines:
+                with metrics.timer("log_write"):
+                    self._file.write("".join(lines))
+                metrics.count("log_events", len(lines))
+            if waiting or stop:
+                with metrics.timer("log_flush"):
+                    self._file.flush()
+                for done in waiting:
+                    done.set()
+            if stop:
+                return
+
@@ -0,0 +1,136 @@
+import threading
+import time
+
+import metrics
+
+
+class GameState:
+    # Vom Server gehaltener Spielzustand: Runde, gezogene Wörter, Markierungen pro Spieler und Gewinner.
+    # Mit den zugeteilten Karten (BingoCard pro Spieler) prüft der Server selbst: Markiert werden nur gezogene Wörter
+    # auf der Karte des Spielers, und eine WIN-Meldung zählt nur, wenn diese Karte tatsächlich Bingo hat.
+    # Alle Änderungen passieren im Serverprozess unter einem gewöhnlichen threading.Lock statt über einen
+    # Manager-Proxy. Änderungen werden an die angemeldeten Listener weitergegeben (z.B. zum Senden an die
+    # Spieler), sodass niemand den Zustand abfragen muss.
+    def __init__(self, num_players, cards=None):
+        self.num_players = num_players
+        self.cards = cards  # BingoCard pro Spieler; ohne Kartenzuteilung (None) werden Meldungen nicht geprüft.
+        self.lock = threading.Lock()
+        self.round_count = 0
+        self.drawn_words = []
+        self.drawn_set = set()
+        self.marks = [set() for _ in range(num_players)]  # Pro Spieler die markierten Wörter.
+        self.round_acks = set()  # Spieler, die in der aktuellen Runde geantwortet (markiert oder gepasst) haben.
+        self.winner = 0  # 1-basierte Spieler-ID des Gewinners, 0 solange es keinen gibt.
+        self.winner_event = threading.Event()  # Wird gesetzt, sobald es einen Gewinner gibt.
+        self.round_done = threading.Event()  # Wird gesetzt, sobald alle geantwortet haben oder es einen Gewinner gibt.
+        self.round_started = time.perf_counter()  # Zeitpunkt der letzten Ziehung, für die Antwortzeit der Spieler.
+        self.listeners = []
+        self.contentions = 0  # Wie oft das Lock bereits belegt war (Maß für Konkurrenz).
+
+    def subscribe(self, listener):
+        # listener(event, round_count, payload) wird nach jeder Änderung außerhalb des Locks aufgerufen.
+        # Ereignisse: "draw" (Wort), "mark" (Spieler-ID, Wort), "ack" (Spieler-ID), "win" (Spieler-ID).
+        self.listeners.append(listener)
+
+    def _acquire(self):
+        if not self.lock.acquire(blocking=False):
+            self.contentions += 1
+            metrics.count("state_lock_contention")
+            self.lock.acquire()
+
+    def _notify(self, event, round_count, payload):
+        for listener in self.listeners:
+            listener(event, round_count, payload)
+
+    def start_round(self, drawn_word):
+        self._acquire()
+        try:
+            self.round_count += 1
+            self.drawn_words.append(drawn_word)
+            self.drawn_set.add(drawn_word)
+            self.round_acks.clear()
+            self.round_started = time.perf_counter()
+            if not self.winner:
+                self.round_done.clear()
+            round_count = self.round_count
+        finally:
+            self.lock.release()
+        self._notify("draw", round_count, drawn_word)
+        return round_count
+
+    def record_mark(self, player_id, word, seq=None):
+        # Speichert die Markierung eines Spielers (0-basiert). Nur bereits gezogene Wörter zählen.
+        # seq ist die Rundennummer der Nachricht; verspätete Nachrichten zählen nicht als Antwort auf die neue Runde.
+        self._acquire()
+        try:
+            if word not in self.drawn_set:
+                return False
+            if self.cards is not None:
+                card = self.cards[player_id]
+                position = card.find(word)
+                if position is None:
+                    return False  # Das Wort steht nicht auf der Karte dieses Spielers.
+                card.mark(*position)
+            self.marks[player_id].add(word)
+            round_count = self.round_count
+            if seq is None or seq == round_count:
+                self._ack(player_id)  # Eine Markierung gilt zugleich als Antwort auf die Runde.
+        finally:
+            self.lock.release()
+        self._notify("mark", round_count, (player_id, word))
+        return True
+
+    def record_ack(self, player_id, seq=None):
+        # Der Spieler (0-basiert) hat die aktuelle Runde abgeschlossen, ohne zu markieren.
+        self._acquire()
+        try:
+            round_count = self.round_count
+            if seq is not None and seq != round_count:
+                return  # Antwort auf eine frühere Runde.
+            self._ack(player_id)
+        finally:
+            self.lock.release()
+        self._notify("ack", round_count, player_id)
+
+    def _ack(self, player_id):
+        # Muss mit gehaltenem Lock aufgerufen werden.
+        if player_id not in self.round_acks:
+            metrics.observe("round_trip", time.perf_counter() - self.round_started)  # Ziehung bis erste Antwort.
+        self.round_acks.add(player_id)
+        if len(self.round_acks) >= self.num_players:
+            self.round_done.set()
+
+    def declare_winner(self, player_id):
+        # Setzt den Gewinner (1-basiert). Nur die erste Meldung zählt, und nur, wenn die Karte des Spielers Bingo hat;
+        # gibt zurück, ob sie gezählt hat.
+        self._acquire()
+        try:
+            if self.winner:
+                return False
+            if self.cards is not None and not self.cards[player_id - 1].has_bingo():
+                metrics.count("win_rejected")
+                return False
+            self.winner = player_id
+            round_count = self.round_count
+        finally:
+            self.lock.release()
+        self.winner_event.set()
+        self.round_done.set()
+        self._notify("win", round_count, player_id)
+        return True
+
+    def all_acknowledged(self):
+        # True, wenn in der aktuellen Runde jeder Spieler geantwortet hat.
+        return len(self.round_acks) >= self.num_players
+
+    def snapshot(self):
+        self._acquire()
+        try:
+            return {
+                "round": self.round_count,
+                "drawn_words": list(self.drawn_words),
+                "marks": [len(marks) for marks in self.marks],
+                "winner": self.winner,
+            }
+        finally:
+            self.lock.release()
@@ -0,0 +1,204 @@
+# Lobby: viele Bingo-Spiele gleichzeitig in einem Serverprozess über einen einzigen Listen-Socket.
+# Jeder Spieler meldet sich zuerst mit JOIN (Raum-ID und Name); die Lobby legt den Raum bei Bedarf an, vergibt
+# eine feste Spieler-ID innerhalb des Raums und reicht die Verbindung an das Spiel des Raums weiter.
+#
+# Aufruf:  python lobby.py --players 4 --size 5 --port 65432
+# Spieler: python main.py <ID> <Spieleranzahl> <Kartengröße> <Name> <Server-IP> <Port> --room <Raum>
+import argparse
+import asyncio
+import re
+
+import metrics
+import protocol
+from async_server import AsyncBingoServer
+from card_pool import CardPool, normalize_words
+from game_log import GameLogger, LOG_FORMATS, log_file_name
+from scheduler import RoundTiming
+
+JOIN_TIMEOUT = 10  # Sekunden, die die Lobby nach dem Verbinden auf die JOIN-Nachricht wartet.
+ROOM_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,32}")  # Raum-IDs landen auch im Namen der Logdatei.
+
+
+class GameRoom(AsyncBingoServer):
+    # Ein Spiel innerhalb der Lobby: eigener Spielzustand, eigene Ziehungen und eigener Gewinner, aber kein
+    # eigener Listen-Socket. Spieler-IDs werden in der Reihenfolge der Beitritte vergeben und bleiben an den
+    # Namen gebunden, sodass ein Spieler nach einem Verbindungsabbruch mit seiner Karte weiterspielen kann.
+    def __init__(self, room_id, num_players, words, timing=RoundTiming(), logger=None, card_size=None, pool=None):
+        player_names = [f"Spieler{i + 1}" for i in range(num_players)]  # Werden beim Beitritt überschrieben.
+        super().__init__(num_players, words, player_names, None, None, timing=timing, logger=logger,
+                         card_size=card_size, pool=pool)
+        self.room_id = room_id
+        self.player_ids = {}  # Name -> Spieler-ID (0-basiert).
+        self.next_player_id = 0  # In der Lobby werden die IDs in der Reihenfolge der Beitritte vergeben.
+
+    def join(self, name):
+        # Gibt die Spieler-ID für name zurück oder None, wenn der Raum voll oder der Name bereits verbunden ist.
+        player_id = self.player_ids.get(name)
+        if player_id is not None:
+            return None if player_id in self.writers else player_id  # Wiederverbinden mit derselben ID.
+        if self.next_player_id >= self.num_players:
+            return None
+        player_id = self.next_player_id
+        self.next_player_id += 1
+        self.player_ids[name] = player_id
+        self.player_names[player_id] = name
+        return player_id
+
+
+class BingoLobby:
+    # Spielregister nach Raum-ID. Alle Räume laufen im selben Event-Loop; ein beendetes Spiel wird aus dem
+    # Register entfernt, sodass die Raum-ID danach für ein neues Spiel frei ist.
+    def __init__(self, words, server_ip, server_port, num_players, card_size=None, timing=RoundTiming(),
+                 log_format=None, max_games=None):
+        self.words = normalize_words(words)
+        self.pool = CardPool(self.words)  # Ein gemeinsamer Kartengenerator statt eines Vokabulars pro Raum.
+        self.server_ip = server_ip
+        self.server_port = server_port  # Port 0 wählt einen freien Port, der nach start() hier steht.
+        self.num_players = num_players  # Spieler pro Raum.
+        self.card_size = card_size
+        self.timing = timing
+        self.log_format = log_format  # Ohne Format wird nicht protokolliert; sonst eine Logdatei pro Raum.
+        self.max_games = max_games  # Nach so vielen beendeten Spielen beendet sich serve(); None = unbegrenzt.
+
+        self.rooms = {}  # Raum-ID -> GameRoom der laufenden bzw. noch nicht gestarteten Spiele.
+        self.games = set()  # Tasks der Räume.
+        self.connections = set()  # Verbindungs-Tasks bis zum Beitritt.
+        self.finished_games = 0
+        self.results = []  # (Raum-ID, Gewinnername oder "", Runden) der beendeten Spiele.
+        self.done = asyncio.Event()
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.server_ip, self.server_port,
+                                                 backlog=1024)
+        self.server_port = self.server.sockets[0].getsockname()[1]
+
+    async def handle_connection(self, reader, writer):
+        connection = asyncio.current_task()
+        self.connections.add(connection)
+        decoder = protocol.FrameDecoder()
+        try:
+            messages = await asyncio.wait_for(protocol.read_messages(reader, decoder), JOIN_TIMEOUT)
+            while not messages:  # Die JOIN-Nachricht kann auf mehrere TCP-Segmente verteilt ankommen.
+                messages = await asyncio.wait_for(protocol.read_messages(reader, decoder), JOIN_TIMEOUT)
+        except (ConnectionError, ValueError, asyncio.TimeoutError):
+            self.connections.discard(connection)
+            writer.close()
+            return
+
+        room, player_id, error = None, None, None
+        if messages[0].type != protocol.JOIN:
+            error = "Die erste Nachricht muss JOIN sein."
+        else:
+            try:
+                request = protocol.decode_state(messages[0])
+                room_id, name = str(request["room"]), str(request["name"])
+            except (ValueError, KeyError, TypeError):
+                room_id = name = None
+                error = "Ungültige JOIN-Nachricht."
+            if error is None and not ROOM_ID_PATTERN.fullmatch(room_id):
+                error = "Ungültige Raum-ID."
+            elif error is None:
+                room = self.rooms.get(room_id) or self.create_room(room_id)
+                player_id = room.join(name)
+                if player_id is None:
+                    error = f"Raum {room_id} ist voll oder {name} ist bereits verbunden."
+        self.connections.discard(connection)
+        if error is not None:
+            metrics.count("joins_rejected")
+            writer.write(protocol.encode_state(0, error=error))
+            writer.close()
+            return
+
+        metrics.count("joins")
+        room.connect_player(player_id, writer, room=room.room_id, name=name)
+        await room.serve_player(player_id, reader, writer, decoder, messages[1:])
+
+    def create_room(self, room_id):
+        logger = None
+        if self.log_format:
+            logger = GameLogger(log_file_name(f"Master-{room_id}", self.log_format), self.log_format)
+        room = GameRoom(room_id, self.num_players, self.words, timing=self.timing, logger=logger,
+                        card_size=self.card_size, pool=self.pool)
+        self.rooms[room_id] = room
+        metrics.count("rooms_created")
+        game = asyncio.ensure_future(self.run_room(room))
+        self.games.add(game)
+        game.add_done_callback(self.games.discard)
+        return room
+
+    async def run_room(self, room):
+        try:
+            winner_id = await room.play()
+            self.results.append((room.room_id, room.player_names[winner_id - 1] if winner_id else "",
+                                 room.round_count))
+        finally:
+            if self.rooms.get(room.room_id) is room:
+                del self.rooms[room.room_id]
+            await room.close()
+            if room.logger is not None:
+                await asyncio.to_thread(room.logger.close)
+            self.finished_games += 1
+            if self.max_games is not None and self.finished_games >= self.max_games:
+                self.done.set()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+        for connection in list(self.connections):
+            connection.cancel()
+        for game in list(self.games):
+            game.cancel()  # run_room schließt den Raum und seine Verbindungen.
+        await asyncio.gather(*self.connections, *self.games, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+
+    async def serve(self):
+        await self.start()
+        try:
+            await self.done.wait()
+        finally:
+            await self.close()
+        return self.results
+
+
+def run_lobby(num_players, words, server_ip, server_port, log_format="text", card_size=None, timing=RoundTiming(),
+              max_games=None):
+    # Einstiegspunkt für `--server-mode lobby` und die Kommandozeile dieses Moduls.
+    lobby = BingoLobby(words, server_ip, server_port, num_players, card_size=card_size, timing=timing,
+                       log_format=log_format, max_games=max_games)
+    print(f"Lobby: {num_players} Spieler pro Raum an {server_ip}:{server_port} ...")
+    metrics.start("Lobby", serve_http=True)
+    try:
+        results = asyncio.run(lobby.serve())
+    except KeyboardInterrupt:
+        print("Die Lobby wurde vom Benutzer beendet.")
+        return
+    finally:
+        metrics.stop()
+    for room_id, winner_name, rounds in results:
+        if winner_name:
+            print(f"Raum {room_id}: {winner_name} hat nach {rounds} Runden gewonnen!")
+        else:
+            print(f"Raum {room_id}: Alle Wörter wurden gezogen, es gibt keinen Gewinner.")
+
+
+def main():
+    from main import read_words_from_file
+
+    parser = argparse.ArgumentParser(description="Lobby für viele gleichzeitige Bingo-Spiele")
+    parser.add_argument("--players", type=int, required=True, help="Spieler pro Raum")
+    parser.add_argument("--size", type=int, default=5, help="Kartengröße")
+    parser.add_argument("--ip", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=65432)
+    parser.add_argument("--games", type=int, default=None, help="Nach so vielen Spielen beenden (Standard: nie)")
+    parser.add_argument("--round-seconds", type=float, default=RoundTiming().round_seconds)
+    parser.add_argument("--pause-seconds", type=float, default=RoundTiming().pause_seconds)
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default="text")
+    args = parser.parse_args()
+    run_lobby(args.players, read_words_from_file("words.txt"), args.ip, args.port, args.log_format, args.size,
+              RoundTiming(args.round_seconds, args.pause_seconds), args.games)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,27 @@
+import argparse
 import curses
+import json
 import random
 import time
 import socket
 import sys
 import subprocess
-from multiprocessing import Process, Manager, Lock
+import threading
+from multiprocessing import Process
 import os
-import pygame
 from datetime import datetime
 
-# Initialize pygame mixer for sound effects
-pygame.mixer.init()
+import audio
+import metrics
+import protocol
+from game_log import GameLogger, LOG_FORMATS, log_file_name
+from renderer import CELL_WIDTH, CardRenderer, cell_label
+from card_pool import CardPool, normalize_words
+from game_state import GameState
+from scheduler import DrawScheduler, RoundTiming
 
-# Load sound effects
-sound1 = pygame.mixer.Sound("sound1.wav")
-countdown_sound = pygame.mixer.Sound("countdown.wav")
-achievement_sound = pygame.mixer.Sound("achievement.wav")
-winning_sound = pygame.mixer.Sound("winning.wav")
-
-CELL_WIDTH = 20  # Fixed width for each cell
+CARD_TIMEOUT = 5  # Sekunden, die ein Spieler nach dem Verbinden auf die vom Server zugeteilte Karte wartet.
+JOIN_TIMEOUT = 5  # Sekunden, die der Server nach dem Verbinden auf die JOIN-Nachricht des Spielers wartet.
 
 
 def read_words_from_file(file_path):  # Definiert eine Funktion, die eine Datei liest und die Wörter zurückgibt.
@@ -32,20 +35,91 @@ def read_words_from_file(file_path):  # Definiert eine Funktion, die eine Datei
 
 
 
+class BingoCard:
+    # Bingo-Karte mit laufenden Trefferzählern pro Zeile, Spalte und Diagonale.
+    # Jede Markierung aktualisiert nur die betroffenen Zähler, dadurch wird ein Sieg in O(1) erkannt.
+    # Die Wörter bleiben erhalten; markierte Felder stehen in einer separaten Bitmaske (Bit y * size + x).
+    def __init__(self, rows):
+        self.size = len(rows)
+        self.cells = [list(row) for row in rows]  # Kopiert die Zeilen, damit die Karte ihren eigenen Zustand besitzt.
+        self.index = {}  # Wort -> (Zeile, Spalte) für die Suche in O(1).
+        for y, row in enumerate(self.cells):
+            for x, word in enumerate(row):
+                self.index.setdefault(word, (y, x))  # Bei doppelten Wörtern gilt das erste Vorkommen.
+        self.marked = 0  # Bitmaske der markierten Felder.
+        # Zähler-Indizes: 0..size-1 Zeilen, size..2*size-1 Spalten, 2*size Hauptdiagonale, 2*size+1 Gegendiagonale.
+        self.line_hits = [0] * (2 * self.size + 2)
+        self.complete_lines = 0  # Anzahl der vollständig markierten Linien.
+        # Linien, denen genau noch ein Feld zum Bingo fehlt; bei einer 1x1-Karte gilt das anfangs für alle Linien.
+        self.near_lines = set(range(len(self.line_hits))) if self.size == 1 else set()
+
+    def __getitem__(self, y):
+        return self.cells[y]  # Erlaubt den gewohnten Zugriff card[y][x].
+
+    def __iter__(self):
+        return iter(self.cells)  # Erlaubt die Iteration über die Zeilen wie bei einer 2D-Liste.
+
+    def __len__(self):
+        return self.size
+
+    def lines_through(self, y, x):
+        # Liefert die Indizes aller Linien, die durch das Feld (y, x) verlaufen.
+        lines = [y, self.size + x]
+        if y == x:
+            lines.append(2 * self.size)
+        if y + x == self.size - 1:
+            lines.append(2 * self.size + 1)
+        return lines
+
+    def find(self, word):
+        return self.index.get(word)  # Liefert (y, x) des Wortes oder None, wenn es nicht auf der Karte steht.
+
+    def word_at(self, y, x):
+        return self.cells[y][x]
+
+    def is_marked(self, y, x):
+        return bool(self.marked >> (y * self.size + x) & 1)
+
+    def mark(self, y, x):
+        # Markiert das Feld (y, x) und aktualisiert die Zähler. Gibt False zurück, wenn es bereits markiert war.
+        bit = 1 << (y * self.size + x)
+        if self.marked & bit:
+            return False
+        self.marked |= bit
+        for line in self.lines_through(y, x):
+            hits = self.line_hits[line] + 1
+            self.line_hits[line] = hits
+            if hits == self.size:
+                self.complete_lines += 1
+                self.near_lines.discard(line)
+            elif hits == self.size - 1:
+                self.near_lines.add(line)
+        return True
+
+    def has_bingo(self):
+        return self.complete_lines > 0  # Konstante Zeit statt erneutem Durchlaufen der ganzen Karte.
+
+    def one_away(self):
+        return len(self.near_lines)  # Anzahl der Linien, denen nur noch ein Feld fehlt.
+
+
 def create_bingo_card(words, size):  # Definiert eine Funktion, die eine Bingo-Karte erstellt.
     unique_words = random.sample(words, size * size)  # Wählt zufällig eine bestimmte Anzahl von einzigartigen Wörtern aus der Liste aus.
-    return [unique_words[i * size:(i + 1) * size] for i in range(size)]  # Teilt die ausgewählten Wörter in eine 2D-Liste auf, um die Bingo-Karte zu erstellen.
+    return BingoCard([unique_words[i * size:(i + 1) * size] for i in range(size)])  # Teilt die ausgewählten Wörter in Zeilen auf und erstellt daraus die Bingo-Karte.
 
 
 def display_bingo_card(window, card, start_y, start_x, size, cursor_y=None, cursor_x=None):
+    # Zeichnet die ganze Karte neu; im Spiel zeichnet CardRenderer nur die geänderten Felder.
     for i in range(size):  # Schleife durch jede Zeile der Bingo-Karte.
         for j in range(size):  # Schleife durch jede Spalte der Bingo-Karte.
-            word = card[i][j]  # Hole das Wort an der aktuellen Position.
-            if len(word) > CELL_WIDTH - 1:
-                word = word[:CELL_WIDTH - 2] + '…'  # Kürze das Wort und füge ein Auslassungszeichen hinzu, wenn es zu lang ist.
+            word = cell_label(card, i, j)  # Hole das (ggf. gekürzte und markierte) Wort an der aktuellen Position.
+            marked = card.is_marked(i, j)
             if cursor_y == i and cursor_x == j:
                 window.addstr(start_y + i * 2, start_x + j * CELL_WIDTH, f"| {word:<{CELL_WIDTH - 1}}",
                               curses.color_pair(3))  # Hebe das Wort hervor, wenn es sich an der Cursorposition befindet.
+            elif marked:
+                window.addstr(start_y + i * 2, start_x + j * CELL_WIDTH, f"| {word:<{CELL_WIDTH - 1}}",
+                              curses.color_pair(4))  # Zeichne markierte Wörter grün.
             else:
                 window.addstr(start_y + i * 2, start_x + j * CELL_WIDTH, f"| {word:<{CELL_WIDTH - 1}}",
                               curses.color_pair(2))  # Zeichne das Wort normal, wenn es sich nicht an der Cursorposition befindet.
@@ -56,6 +130,8 @@ def display_bingo_card(window, card, start_y, start_x, size, cursor_y=None, curs
 
 
 def check_word_on_card(card, word):  # Definiert eine Funktion, die überprüft, ob ein bestimmtes Wort auf der Bingo-Karte vorhanden ist.
+    if isinstance(card, BingoCard):
+        return card.find(word) is not None  # Nachschlagen im Wort-Index statt Durchsuchen jeder Zeile.
     for row in card:  # Schleife durch jede Zeile der Bingo-Karte.
         if word in row:  # Überprüft, ob das Wort in der aktuellen Zeile enthalten ist.
             return True  # Gibt True zurück, wenn das Wort gefunden wurde.
@@ -63,19 +139,29 @@ def check_word_on_card(card, word):  # Definiert eine Funktion, die überprüft,
 
 
 def mark_word_on_card(card, y, x):
-    # Markiert das Wort an den Koordinaten (y, x) auf der Bingo-Karte mit einem "X".
-    card[y][x] = "X"
+    # Markiert das Wort an den Koordinaten (y, x) auf der Bingo-Karte. Gibt False zurück, wenn es bereits markiert war.
+    if isinstance(card, BingoCard):
+        return card.mark(y, x)  # Setzt das Bit in der Markierungsmaske und aktualisiert die Trefferzähler.
+    if card[y][x] == "X":
+        return False
+    card[y][x] = "X"  # Einfache 2D-Listen werden weiterhin mit "X" überschrieben.
+    return True
 
 
 def check_winner(card, size):  # Definiert eine Funktion, die überprüft, ob es einen Gewinner auf der Bingo-Karte gibt.
-    # Überprüft die Hauptdiagonale und die Gegendiagonale auf ein "X" in jeder Zelle.
-    if all(card[i][i] == "X" for i in range(size)) or all(card[i][size - 1 - i] == "X" for i in range(size)):
-        return True  # Gibt True zurück, wenn eine der beiden Diagonalen vollständig mit "X" gefüllt ist.
+    # Referenzimplementierung mit vollständigem Durchlauf (O(n²)); im Spiel wird BingoCard.has_bingo() verwendet.
+    if isinstance(card, BingoCard):
+        marked = card.is_marked  # Liest die Markierungen aus der Bitmaske der Karte.
+    else:
+        marked = lambda y, x: card[y][x] == "X"  # Einfache 2D-Listen markieren Felder mit "X".
+    # Überprüft die Hauptdiagonale und die Gegendiagonale auf eine Markierung in jeder Zelle.
+    if all(marked(i, i) for i in range(size)) or all(marked(i, size - 1 - i) for i in range(size)):
+        return True  # Gibt True zurück, wenn eine der beiden Diagonalen vollständig markiert ist.
     for i in range(size):
-        # Überprüft jede Zeile und jede Spalte auf ein "X" in jeder Zelle.
-        if all(card[i][j] == "X" for j in range(size)) or all(card[j][i] == "X" for j in range(size)):
-            return True  # Gibt True zurück, wenn eine Zeile oder Spalte vollständig mit "X" gefüllt ist.
-    return False  # Gibt False zurück, wenn keine vollständige Zeile, Spalte oder Diagonale mit "X" gefüllt ist.
+        # Überprüft jede Zeile und jede Spalte auf eine Markierung in jeder Zelle.
+        if all(marked(i, j) for j in range(size)) or all(marked(j, i) for j in range(size)):
+            return True  # Gibt True zurück, wenn eine Zeile oder Spalte vollständig markiert ist.
+    return False  # Gibt False zurück, wenn keine vollständige Zeile, Spalte oder Diagonale markiert ist.
 
 
 
@@ -90,17 +176,20 @@ def get_input(window, prompt, y=0, x=0):  # Definiert eine Funktion, die eine Ei
 
 
 def log_event(log_file, event):  # Definiert eine Funktion, die ein Ereignis in eine Logdatei schreibt.
+    # Ungepufferte Einzelschreibweise; im Spiel wird GameLogger aus game_log.py verwendet.
     with open(log_file, 'a') as f:  # Öffnet die Logdatei im Anhängemodus.
         timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")  # Erstellt einen Zeitstempel im Format Jahr-Monat-Tag-Stunde-Minute-Sekunde.
         f.write(f"{timestamp} {event}\n")  # Schreibt den Zeitstempel und das Ereignis in die Logdatei, gefolgt von einem Zeilenumbruch.
 
 
 
-def player_process(player_id, num_players, card_size, words, player_name, server_ip, server_port):
-    # Erstellen eines Logdateinamens basierend auf dem aktuellen Datum und der Uhrzeit.
-    log_file = f"{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}-bingo-Spieler{player_id + 1}.txt"
+def player_process(player_id, num_players, card_size, words, player_name, server_ip, server_port, log_format="text",
+                   room=None):
+    # Erstellt ein gepuffertes Log mit einem Dateinamen basierend auf dem aktuellen Datum und der Uhrzeit.
+    logger = GameLogger(log_file_name(f"Spieler{player_id + 1}", log_format), log_format)
 
     def main(stdscr):
+        nonlocal player_id
         # Initialisiert Farben für curses.
         curses.start_color()
         curses.init_pair(1, curses.COLOR_CYAN, curses.COLOR_BLACK)
@@ -108,50 +197,117 @@ def player_process(player_id, num_players, card_size, words, player_name, server
         curses.init_pair(4, curses.COLOR_GREEN, curses.COLOR_BLACK)  # Grüne Textfarbe
         curses.init_pair(5, curses.COLOR_RED, curses.COLOR_BLACK)
 
-        # Erstellt die Bingo-Karte und bereitet das Fenster vor.
-        card = create_bingo_card(words, card_size)
-        window = stdscr
-        window.clear()
-        window.addstr(0, 0, f"{player_name}'s Karte:", curses.color_pair(1))
-        display_bingo_card(window, card, 2, 0, card_size)
-
-        # Loggt den Spielstart und die Kartengröße.
-        log_event(log_file, "Start des Spiels")
-        log_event(log_file, f"Größe des Spielfelds: ({card_size}x{card_size})")
-
         # Verbindet sich mit dem Server.
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             try:
                 s.connect((server_ip, server_port))
-                s.setblocking(False)
             except ConnectionRefusedError:
                 print(f"Unable to connect to server at {server_ip}:{server_port}")
                 sys.exit(1)
+            decoder = protocol.FrameDecoder()  # Setzt die Frames des Servers aus dem TCP-Strom zusammen.
+            # Meldet sich mit Name und Spieler-ID an; die Lobby vergibt die ID im Raum (room) selbst.
+            s.sendall(protocol.encode_join(room, player_name, player_id if room is None else None))
+
+            # Wartet insgesamt höchstens CARD_TIMEOUT Sekunden auf die vom Server zugeteilte Karte (STATE-Nachricht).
+            # Eine große Karte kann auf mehrere TCP-Segmente verteilt ankommen, daher wird bis zum vollständigen
+            # Frame weitergelesen.
+            deadline = time.monotonic() + CARD_TIMEOUT
+            pending = []
+            while not any(message.type == protocol.STATE for message in pending):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                s.settimeout(remaining)
+                try:
+                    pending += protocol.recv_messages(s, decoder)
+                except (socket.timeout, ConnectionError, ValueError):
+                    break  # Ohne gültige Karte beendet sich der Spieler unten.
+            s.setblocking(False)
+            card = None
+            for message in pending:
+                if message.type == protocol.STATE:
+                    try:
+                        state = protocol.decode_state(message)
+                    except ValueError:
+                        continue  # Beschädigte Zustandsmeldung; ohne Karte wird unten abgebrochen.
+                    if 'error' in state:
+                        print(state['error'])  # Z.B. ein voller Raum in der Lobby.
+                        sys.exit(1)
+                    if 'card' in state:
+                        card = BingoCard(state['card'])
+                    player_id = state.get('player_id', player_id)  # Die vom Server vergebene ID gilt.
+            pending = [message for message in pending if message.type != protocol.STATE]
+            if card is None:
+                # Der Server prüft Markierungen und Bingo anhand der zugeteilten Karte. Mit einer selbst erstellten
+                # Karte würde er jede Markierung und jeden Sieg stillschweigend verwerfen.
+                logger.log("Keine Karte vom Server erhalten", player=player_id + 1)
+                sys.exit(f"Keine Karte vom Server {server_ip}:{server_port} erhalten.")  # Meldung nach Ende von curses.
+
+            # Bereitet das Fenster vor.
+            window = stdscr
+            window.clear()
+            renderer = CardRenderer(window, card_size, 2, 0)  # Zeichnet ab jetzt nur noch geänderte Felder neu.
+            renderer.draw_line(0, 0, f"{player_name}'s Karte:", 1)
+            renderer.render(card)
+
+            # Loggt den Spielstart, die Kartengröße und die Karte selbst, damit replay.py Siege nachprüfen kann.
+            logger.log("Start des Spiels", player=player_id + 1)
+            logger.log(f"Größe des Spielfelds: ({card_size}x{card_size})", player=player_id + 1)
+            logger.log(f"Karte von {player_name}: {json.dumps(card.cells, ensure_ascii=False)}", player=player_id + 1)
 
             cursor_y, cursor_x = 0, 0
+            drawn_word = ''  # Noch wurde kein Wort gezogen.
+            answered = False
+            round_seq = 0  # Rundennummer der zuletzt empfangenen Ziehung.
             window.timeout(100)  # Setzt das Timeout auf 100 Millisekunden.
 
             while True:
-                try:
-                    # Empfangt das gezogene Wort vom Server.
-                    drawn_word = s.recv(1024).decode('utf-8')
-                    if drawn_word == 'WIN':
-                        # Beendet das Spiel, wenn ein Spieler gewonnen hat.
-                        window.addstr(card_size * 2 + 5, 0, f"{player_name} hat gewonnen!", curses.color_pair(1))
+                if pending:
+                    messages, pending = pending, []  # Zuerst die Nachrichten, die mit der Karte ankamen.
+                else:
+                    try:
+                        # Empfängt alle vollständig angekommenen Nachrichten vom Server.
+                        with metrics.timer("recv"):
+                            messages = protocol.recv_messages(s, decoder)
+                        metrics.count("messages_received", len(messages))
+                    except BlockingIOError:
+                        messages = []
+                        metrics.count("recv_would_block")  # Leerlauf der nicht blockierenden Schleife.
+                    except ConnectionError:
+                        logger.log("Verbindung zum Server getrennt", round_seq, player_id + 1)
+                        return
+                    except ValueError:
+                        # Ungültiger Frame; der Datenstrom ist danach nicht mehr synchron, also wird aufgehört.
+                        logger.log("Ungültige Daten vom Server", round_seq, player_id + 1)
+                        return
+
+                for message in messages:
+                    if message.type == protocol.WIN:
+                        # Beendet das Spiel, wenn ein Spieler gewonnen hat; die Nutzlast enthält den Namen des Gewinners.
+                        if message.payload:
+                            renderer.draw_line(card_size * 2 + 5, 0, f"{message.payload} hat gewonnen!", 1)
+                            if message.payload == player_name:
+                                audio.play("winning")  # Erst der Server bestätigt den eigenen Sieg.
+                            logger.log(f"{message.payload} hat gewonnen!", message.seq, player_id + 1)
+                        else:
+                            # Leere Nutzlast: Alle Wörter wurden gezogen, ohne dass jemand gewonnen hat.
+                            renderer.draw_line(card_size * 2 + 5, 0, "Alle Wörter wurden gezogen, es gibt keinen Gewinner.", 1)
+                            logger.log("Kein Gewinner", message.seq, player_id + 1)
                         window.refresh()
-                        pygame.mixer.Sound.play(winning_sound)
-                        log_event(log_file, "Sieg")
+                        logger.flush()
                         time.sleep(300)  # Wartet 5 Minuten.
-                        log_event(log_file, "Ende des Spiels")
+                        logger.log("Ende des Spiels", message.seq, player_id + 1)
                         return
-                    # Aktualisiert die Anzeige.
-                    window.clear()
-                    window.addstr(0, 0, f"{player_name}'s Karte: ", curses.color_pair(4))
-                    display_bingo_card(window, card, 2, 0, card_size, cursor_y, cursor_x)
-                    question_y = 2 + card_size * 2 + 1
-                    window.addstr(question_y, 0, f"Haben Sie das Wort {drawn_word} auf der Karte?", curses.color_pair(1))
-                except BlockingIOError:
-                    pass
+                    if message.type == protocol.DRAW:
+                        drawn_word = message.payload
+                        round_seq = message.seq
+                        answered = False  # Ob der Spieler auf diese Runde schon geantwortet hat.
+                        logger.log(f"Runde {round_seq}: Das gezogene Wort lautet: {drawn_word}", round_seq, player_id + 1)
+                        # Aktualisiert nur die Kopf- und die Fragezeile; die Karte selbst bleibt stehen.
+                        renderer.draw_line(0, 0, f"{player_name}'s Karte: ", 4)
+                        question_y = 2 + card_size * 2 + 1
+                        renderer.draw_line(question_y, 0, f"Haben Sie das Wort {drawn_word} auf der Karte? "
+                                                          f"(Enter: markieren, Leertaste: nicht dabei)", 1)
 
                 # Verarbeitet Benutzereingaben.
                 key = window.getch()
@@ -163,52 +319,87 @@ def player_process(player_id, num_players, card_size, words, player_name, server
                     cursor_x -= 1
                 elif key == curses.KEY_RIGHT and cursor_x < card_size - 1:
                     cursor_x += 1
+                elif key == ord(' ') and drawn_word and not answered:
+                    # Meldet dem Server, dass das Wort nicht auf der Karte ist; so kann die Runde früher enden.
+                    s.setblocking(True)
+                    protocol.send_messages(s, [(protocol.ACK, round_seq, "")])
+                    s.setblocking(False)
+                    answered = True
                 elif key == ord('\n'):
-                    if check_word_on_card(card, drawn_word) and card[cursor_y][cursor_x] == drawn_word:
-                        mark_word_on_card(card, cursor_y, cursor_x)
-                        pygame.mixer.Sound.play(achievement_sound)
-                        log_event(log_file, f"{drawn_word} ({cursor_x},{cursor_y})")
-                        if check_winner(card, card_size):
-                            s.sendall(b'WIN')
-                            pygame.mixer.Sound.play(winning_sound)
-                            window.addstr(card_size * 2 + 5, 0, f"{player_name} hat gewonnen!", curses.color_pair(1))
-                            window.refresh()
-                            log_event(log_file, "Sieg")
-                            time.sleep(300)  # Wartet 5 Minuten.
-                            log_event(log_file, "Ende des Spiels")
-                            return
-                display_bingo_card(window, card, 2, 0, card_size, cursor_y, cursor_x)
-
-    curses.wrapper(main)  # Startet die curses-Hauptschleife.
-
-
-def handle_player_connection(conn, addr, shared_state, num_players, lock, player_names):
-    # Bestimmt die Spieler-ID basierend auf der Adresse des Spielers und der Anzahl der Spieler.
-    player_id = addr[1] % num_players
+                    # Prüft in O(1) über den Wort-Index, ob das Wort auf der Karte und unter dem Cursor steht.
+                    if check_word_on_card(card, drawn_word) and card.word_at(cursor_y, cursor_x) == drawn_word \
+                            and mark_word_on_card(card, cursor_y, cursor_x):
+                        audio.play("achievement")
+                        logger.log(f"{drawn_word} ({cursor_x},{cursor_y})", round_seq, player_id + 1, (cursor_y, cursor_x))
+                        replies = [(protocol.MARK, round_seq, drawn_word)]
+                        answered = True
+                        with metrics.timer("win_check"):
+                            bingo = card.has_bingo()
+                        if bingo:
+                            replies.append((protocol.WIN, round_seq, player_name))
+                        s.setblocking(True)
+                        protocol.send_messages(s, replies)  # Markierung und ggf. Bingo gehen in einem Aufruf raus.
+                        s.setblocking(False)
+                        if bingo:
+                            # Der Server kann die Meldung ablehnen (z.B. wenn in derselben Runde jemand schneller war).
+                            # Den Sieg zeigt daher erst seine WIN-Nachricht an; bis dahin wird weitergelesen.
+                            renderer.draw_line(card_size * 2 + 5, 0, "Bingo gemeldet, warte auf den Server ...", 1)
+                            logger.log("Sieg", round_seq, player_id + 1)
+                            logger.flush()
+                with metrics.timer("render"):
+                    renderer.render(card, cursor_y, cursor_x)  # Gibt nur Änderungen aus (Cursor: 2 Felder, Markierung: 1 Feld).
+
+    metrics.start(f"Spieler{player_id + 1}")
+    try:
+        curses.wrapper(main)  # Startet die curses-Hauptschleife.
+    finally:
+        logger.close()  # Schreibt die restlichen Einträge und schließt die Logdatei.
+        metrics.stop()
 
-    while True:
-        with lock:
-            drawn_word = shared_state['drawn_word']  # Holt das gezogene Wort aus dem gemeinsam genutzten Zustand.
 
-        conn.sendall(drawn_word.encode('utf-8'))  # Sendet das gezogene Wort an den Spieler.
+def handle_player_connection(conn, player_id, state, decoder=None, pending=(), disconnect=None):
+    # Läuft als Thread im Serverprozess und trägt die Antworten des Spielers direkt in den Spielzustand ein.
+    # Die gezogenen Wörter verteilt master_process als DRAW-Frames; hier werden nur die Antworten des Spielers gelesen.
+    # pending sind bereits empfangene Nachrichten (die, die zusammen mit dem JOIN ankamen); disconnect(conn) nimmt
+    # die Verbindung aus der Verteilerliste des Servers, bevor sie geschlossen wird.
+    conn.setblocking(True)
+    decoder = decoder or protocol.FrameDecoder()
+    messages = list(pending)
+
+    while True:
+        for message in messages:
+            if message.type == protocol.MARK:
+                state.record_mark(player_id, message.payload, message.seq)  # Merkt sich, dass der Spieler markiert hat.
+            elif message.type == protocol.ACK:
+                state.record_ack(player_id, message.seq)  # Der Spieler hat das Wort nicht auf der Karte.
+            elif message.type == protocol.WIN:
+                # Setzt den Gewinner im Spielzustand; eine Meldung ohne Bingo auf der Karte wird verworfen.
+                if state.declare_winner(player_id + 1):
+                    return  # Beendet die Schleife, wenn ein Spieler gewonnen hat.
 
         try:
-            player_response = conn.recv(1024).decode('utf-8')  # Empfängt die Antwort des Spielers.
-        except ConnectionResetError:
-            break  # Beendet die Schleife, wenn die Verbindung zurückgesetzt wurde.
+            messages = protocol.recv_messages(conn, decoder)  # Empfängt die Antworten des Spielers.
+        except (ConnectionError, OSError):
+            break  # Beendet die Schleife, wenn die Verbindung geschlossen oder zurückgesetzt wurde.
+        except ValueError:
+            break  # Ungültiger Frame; wie in async_server.py wird nur diese Verbindung beendet, nicht das Spiel.
 
-        if not player_response:
-            break  # Beendet die Schleife, wenn keine Spielerantwort empfangen wurde.
+        metrics.count("messages_received", len(messages))
 
-        with lock:
-            if player_response == 'WIN':
-                shared_state['winner'] = player_id + 1  # Setzt den Gewinner im gemeinsam genutzten Zustand.
-                break  # Beendet die Schleife, wenn ein Spieler gewonnen hat.
+    # Der Spieler erhält keine Ziehungen mehr und bemerkt das Ende der Verbindung, statt ins Leere zu antworten.
+    if disconnect is not None:
+        disconnect(conn)
+    conn.close()
 
 
-def master_process(num_players, words, shared_state, server_ip, server_port, lock, player_names):
-    # Erstellt einen Dateinamen für das Log basierend auf dem aktuellen Datum und der Uhrzeit.
-    log_file = f"{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}-bingo-Master.txt"
+def master_process(num_players, words, server_ip, server_port, player_names, log_format="text", card_size=None,
+                   timing=RoundTiming()):
+    # Erstellt ein gepuffertes Log mit einem Dateinamen basierend auf dem aktuellen Datum und der Uhrzeit.
+    logger = GameLogger(log_file_name("Master", log_format), log_format)
+
+    # Erzeugt alle Karten vorab in einem Durchlauf; jeder Spieler erhält seine Karte beim Verbinden.
+    pool = CardPool(words)
+    cards = pool.generate(num_players, card_size) if card_size else []
 
     def main(stdscr):
         # Initialisiert Farben für curses.
@@ -221,110 +412,167 @@ def master_process(num_players, words, shared_state, server_ip, server_port, loc
         window.clear()
         window.addstr(0, 0, "Master Terminal: Buzzword Bingo Game")  # Zeigt den Titel des Spiels an.
 
-        log_event(log_file, "Start des Spiels")  # Schreibt den Spielstart in das Logfile.
+        logger.log("Start des Spiels")  # Schreibt den Spielstart in das Logfile.
 
         max_y, max_x = stdscr.getmaxyx()
         timer_window = curses.newwin(3, 30, 0, max_x - 30)  # Erstellt ein neues Fenster für den Timer.
 
         round_count = 0  # Zählt die Runden.
-        drawn_words = set()  # Hält die bereits gezogenen Wörter fest.
+        scheduler = DrawScheduler(words)  # Zieht jedes Wort höchstens einmal, in O(1) pro Ziehung.
+
+        # Der Spielzustand gehört dem Server; Änderungen werden direkt an alle Spieler gesendet.
+        # Mit den zugeteilten Karten prüft der Zustand Markierungen und WIN-Meldungen selbst.
+        state = GameState(num_players, [BingoCard(pool.card_rows(card, card_size)) for card in cards] or None)
+        connections = []
+        send_lock = threading.Lock()  # Verhindert, dass sich Frames verschiedener Threads vermischen.
+
+        def disconnect(conn):
+            with send_lock:
+                if conn in connections:
+                    connections.remove(conn)
+
+        def push(event, round_count, payload):
+            if event == "draw":
+                frame = protocol.encode_message(protocol.DRAW, round_count, payload)
+            elif event == "win":
+                winner_name = player_names[payload - 1] if payload else ""  # Leerer Name: kein Gewinner.
+                frame = protocol.encode_message(protocol.WIN, round_count, winner_name)
+            else:
+                return  # Markierungen und Antworten bleiben beim Server.
+            with send_lock, metrics.timer("broadcast"):
+                for conn in connections:  # Einmal kodieren, an alle senden.
+                    try:
+                        conn.sendall(frame)
+                    except OSError:
+                        pass  # Ein getrennter Spieler hält die anderen nicht auf.
+            metrics.count("messages_sent", len(connections))
+
+        state.subscribe(push)
 
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
                 s.bind((server_ip, server_port))  # Bindet den Socket an die angegebene IP-Adresse und Portnummer.
                 s.listen(num_players)  # Setzt den Socket in den Listen-Modus für die Anzahl der Spieler.
                 s.setblocking(False)
-                connections = []
 
                 # Akzeptiert Verbindungen von allen Spielern.
-                while len(connections) < num_players:
+                taken = set()  # Bereits vergebene Spieler-IDs.
+                while len(taken) < num_players:
                     try:
                         conn, addr = s.accept()
-                        connections.append(conn)
-                        # Startet einen neuen Prozess für die Behandlung der Spieler-Verbindung.
-                        Process(target=handle_player_connection, args=(conn, addr, shared_state, num_players, lock, player_names)).start()
                     except BlockingIOError:
-                        pass
+                        metrics.count("accept_would_block")  # Leerlauf der nicht blockierenden Annahmeschleife.
+                        continue
+                    # Die Spieler starten in eigenen Terminals und verbinden sich in zufälliger Reihenfolge; die
+                    # Spieler-ID (und damit Name, Karte und Log) kommt daher aus der JOIN-Nachricht des Spielers.
+                    decoder = protocol.FrameDecoder()
+                    messages = []
+                    conn.settimeout(JOIN_TIMEOUT)
+                    try:
+                        while not messages:  # Die JOIN-Nachricht kann auf mehrere TCP-Segmente verteilt ankommen.
+                            messages = protocol.recv_messages(conn, decoder)
+                    except socket.timeout:
+                        pass  # Ohne JOIN erhält der Spieler die erste freie ID.
+                    except (ConnectionError, ValueError):
+                        conn.close()
+                        continue
+                    join = messages[0] if messages and messages[0].type == protocol.JOIN else None
+                    player_id = protocol.join_player_id(join, player_names, taken)
+                    taken.add(player_id)
+                    if cards:
+                        rows = pool.card_rows(cards[player_id], card_size)
+                        try:
+                            # Teilt dem Spieler seine ID und seine Karte zu.
+                            conn.sendall(protocol.encode_state(0, player_id=player_id, card=rows))
+                        except OSError:
+                            pass  # Der Thread bemerkt die getrennte Verbindung und beendet sich.
+                    with send_lock:
+                        connections.append(conn)
+                    # Startet einen Thread für die Antworten des Spielers.
+                    threading.Thread(target=handle_player_connection,
+                                     args=(conn, player_id, state, decoder, messages[1:] if join else messages,
+                                           disconnect),
+                                     daemon=True).start()
 
                 while True:
-                    with lock:
-                        if shared_state['winner']:
-                            break  # Beendet die Schleife, wenn ein Gewinner festgestellt wurde.
+                    if state.winner:
+                        break  # Beendet die Schleife, wenn ein Gewinner festgestellt wurde.
 
-                    round_count += 1  # Erhöht die Rundenanzahl.
-                    drawn_word = random.choice(words)  # Wählt ein zufälliges Wort aus der Wortliste.
-                    while drawn_word in drawn_words:
-                        drawn_word = random.choice(words)  # Wählt erneut, falls das Wort bereits gezogen wurde.
-                    drawn_words.add(drawn_word)  # Fügt das gezogene Wort der Menge der gezogenen Wörter hinzu.
+                    drawn_word = scheduler.draw()  # Nächstes Wort aus der vorab gemischten Reihenfolge.
+                    if drawn_word is None:
+                        break  # Alle Wörter wurden gezogen, ohne dass jemand gewonnen hat.
 
-                    with lock:
-                        shared_state['drawn_word'] = drawn_word  # Aktualisiert den gezogenen Wort im gemeinsamen Zustand.
+                    # Startet die Runde im Spielzustand; dadurch wird das Wort an alle Spieler gesendet.
+                    round_count = state.start_round(drawn_word)
 
                     window.clear()
                     window.addstr(0, 0, f"Runde {round_count}: Das gezogene Wort lautet: {drawn_word}",
                                   curses.color_pair(1))  # Zeigt das gezogene Wort und die Runde an.
-                    log_event(log_file, f"Runde {round_count}: Das gezogene Wort lautet: {drawn_word}")  # Schreibt das Ereignis in das Logfile.
+                    logger.log(f"Runde {round_count}: Das gezogene Wort lautet: {drawn_word}", round_count)  # Schreibt das Ereignis in das Logfile.
 
                     window.refresh()
 
-                    # Sendet das gezogene Wort an alle verbundenen Spieler.
-                    for conn in connections:
-                        conn.sendall(drawn_word.encode('utf-8'))
-
-                    start_time = time.time()
-                    countdown_seconds = 30
+                    # Die Runde endet nach Ablauf der Zeit oder sofort, wenn alle Spieler geantwortet haben
+                    # oder jemand gewonnen hat. Die Anzeige blinkt im Halbsekundentakt.
+                    deadline = time.monotonic() + timing.round_seconds
                     play_countdown_sound = True
+                    color_pairs = [2, 3]
 
                     while True:
-                        remaining_time = countdown_seconds - int(time.time() - start_time)
-                        if remaining_time < 0:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
                             break
 
-                        for color_pair in [2, 3]:
-                            timer_window.clear()
-                            timer_window.addstr(0, 7, f"Zeit übrig: {remaining_time} Sekunden",
-                                                curses.color_pair(color_pair))
-                            timer_window.refresh()
-                            time.sleep(0.5)
+                        timer_window.clear()
+                        timer_window.addstr(0, 7, f"Zeit übrig: {int(remaining)} Sekunden",
+                                            curses.color_pair(color_pairs[0]))
+                        timer_window.refresh()
+                        color_pairs.reverse()
 
-                        if remaining_time <= 10 and play_countdown_sound:
-                            pygame.mixer.Sound.play(countdown_sound)
+                        if remaining <= timing.warning_seconds and play_countdown_sound:
+                            audio.play("countdown")
                             play_countdown_sound = False
 
-                        with lock:
-                            if shared_state['winner']:
-                                break
-
-                    with lock:
-                        if shared_state['winner']:
+                        if state.round_done.wait(min(0.5, remaining)):
                             break
 
-                    end_time = time.time() + 2
-                    while time.time() < end_time:
-                        time.sleep(0.1)
+                    logger.flush()  # Schreibt die Einträge der Runde am Rundenende auf die Platte.
+
+                    if state.winner:
+                        break
 
-                    time.sleep(2)
+                    state.winner_event.wait(timing.pause_seconds)  # Pause zwischen den Runden, endet bei einem Sieg.
 
-                winner_id = shared_state['winner']
-                for conn in connections:
-                    conn.sendall(b'WIN')
+                winner_id = state.winner  # Die WIN-Nachricht hat push() bereits an alle Spieler gesendet.
 
-                window.addstr(4, 0, f"{player_names[winner_id - 1]} hat gewonnen!", curses.color_pair(1))
+                if winner_id:
+                    window.addstr(4, 0, f"{player_names[winner_id - 1]} hat gewonnen!", curses.color_pair(1))
+                    logger.log(f"{player_names[winner_id - 1]} hat gewonnen!", round_count, winner_id)
+                else:
+                    # Ohne Gewinner erhalten die Spieler eine WIN-Nachricht ohne Namen.
+                    push("win", round_count, 0)
+                    window.addstr(4, 0, "Alle Wörter wurden gezogen, es gibt keinen Gewinner.", curses.color_pair(1))
+                    logger.log("Alle Wörter wurden gezogen, es gibt keinen Gewinner.", round_count)
                 window.refresh()
-                log_event(log_file, f"{player_names[winner_id - 1]} hat gewonnen!")
-                log_event(log_file, "Ende des Spiels")
+                logger.log("Ende des Spiels", round_count)
+                logger.flush()
                 time.sleep(300)  # Wartet 5 Minuten, bevor das Programm beendet wird.
 
         except KeyboardInterrupt:
             window.addstr(4, 0, "Das Spiel wurde vom Benutzer abgebrochen.", curses.color_pair(1))
             window.refresh()
-            log_event(log_file, "Abbruch")
+            logger.log("Abbruch")
             time.sleep(2)
 
-    curses.wrapper(main)  # Startet die curses-Hauptschleife.
+    metrics.start("Master", serve_http=True)
+    try:
+        curses.wrapper(main)  # Startet die curses-Hauptschleife.
+    finally:
+        logger.close()  # Schreibt die restlichen Einträge und schließt die Logdatei.
+        metrics.stop()
 
 
-def main():
+def main(server_mode="process", no_audio=False, log_format="text", timing=RoundTiming()):
     # Eingabe der Anzahl der Spieler
     num_players_str = input("Bitte geben Sie die Anzahl der Spieler ein: ")
     num_players = int(num_players_str)
@@ -336,38 +584,45 @@ def main():
     # Eingabe der Namen der Spieler
     player_names = [input(f"Name des Spielers {i + 1}: ") for i in range(num_players)]
 
-    # Liest die Wörter aus der Datei "words.txt"
-    words = read_words_from_file("words.txt")
+    # Liest die Wörter aus der Datei "words.txt" und bereinigt sie (Leerzeichen, Duplikate).
+    words = normalize_words(read_words_from_file("words.txt"))
 
     # Konfiguration für den Server
     server_ip = '127.0.0.1'
     server_port = 65432
 
-    # Initialisiert den gemeinsamen Zustand und den Lock für die Synchronisation
-    manager = Manager()
-    shared_state = manager.dict()
-    shared_state['drawn_word'] = ''
-    shared_state['winner'] = 0
-    lock = Lock()
-
-    # Initialisiert die Markierungen der Spieler in shared_state
-    for i in range(num_players):
-        shared_state[f"player_{i}_marked"] = False
+    # Der Spielzustand liegt vollständig im Master-Prozess (GameState); ein Manager-Prozess wird nicht benötigt.
+    if server_mode == "asyncio":
+        # Ein einziger Event-Loop bedient alle Spieler.
+        from async_server import run_async_server
+        master_process_instance = Process(target=run_async_server, args=(
+            num_players, words, server_ip, server_port, player_names, log_format, card_size, timing))
+    elif server_mode == "lobby":
+        # Die Lobby führt hier genau ein Spiel im Raum "1"; die Spieler melden sich mit JOIN an.
+        from lobby import run_lobby
+        master_process_instance = Process(target=run_lobby, args=(
+            num_players, words, server_ip, server_port, log_format, card_size, timing, 1))
+    else:
+        master_process_instance = Process(target=master_process, args=(
+            num_players, words, server_ip, server_port, player_names, log_format, card_size, timing))
 
     players = []
 
     # Startet den Master-Prozess in einem separaten Prozess
-    master_process_instance = Process(target=master_process, args=(
-        num_players, words, shared_state, server_ip, server_port, lock, player_names))
     master_process_instance.start()
 
+    # Gibt `--no-audio` und das Log-Format an die Spieler-Terminals weiter.
+    player_options = f" --log-format {log_format}" + (" --no-audio" if no_audio else "")
+    if server_mode == "lobby":
+        player_options += " --room 1"
+
     # Startet die Spieler-Prozesse für jeden Spieler
     for i in range(num_players):
         # Bestimmt den Befehl je nach Betriebssystem für das Starten eines neuen Terminals oder einer neuen CMD-Sitzung
         if os.name == 'nt':
-            player_terminal_command = f'start cmd /k python {sys.argv[0]} {i} {num_players} {card_size} "{player_names[i]}" {server_ip} {server_port}'
+            player_terminal_command = f'start cmd /k python {sys.argv[0]} {i} {num_players} {card_size} "{player_names[i]}" {server_ip} {server_port}{player_options}'
         else:
-            player_terminal_command = f'x-terminal-emulator -e "python3 {sys.argv[0]} {i} {num_players} {card_size} {player_names[i]} {server_ip} {server_port}"'
+            player_terminal_command = f'x-terminal-emulator -e "python3 {sys.argv[0]} {i} {num_players} {card_size} {player_names[i]} {server_ip} {server_port}{player_options}"'
 
         # Startet den Spieler-Prozess mit dem entsprechenden Befehl
         player_process_instance = subprocess.Popen(player_terminal_command, shell=True)
@@ -381,18 +636,53 @@ def main():
         player.terminate()
 
 
+def parse_args(argv):
+    # Liest die Kommandozeilenoptionen; die Positionsargumente sind für einzelne Spielerprozesse reserviert.
+    parser = argparse.ArgumentParser(description="Buzzword Bingo")
+    parser.add_argument("player_args", nargs="*",
+                        help="Intern: Spieler-ID, Spieleranzahl, Kartengröße, Name, Server-IP und Port eines Spielerprozesses")
+    parser.add_argument("--server-mode", choices=["process", "asyncio", "lobby"], default="process",
+                        help="process: ein Prozess pro Spieler (Standard), asyncio: ein Event-Loop für alle Spieler, "
+                             "lobby: viele Spiele in einem Server (siehe lobby.py)")
+    parser.add_argument("--room",
+                        help="Intern: Raum-ID, mit der sich ein Spielerprozess in der Lobby anmeldet")
+    parser.add_argument("--no-audio", action="store_true",
+                        help="Schaltet alle Soundeffekte ab (auch automatisch, wenn kein Audiogerät vorhanden ist)")
+    parser.add_argument("--round-seconds", type=float, default=RoundTiming().round_seconds,
+                        help="Maximale Dauer einer Runde; sie endet früher, sobald alle geantwortet haben (0 = sofort)")
+    parser.add_argument("--pause-seconds", type=float, default=RoundTiming().pause_seconds,
+                        help="Pause zwischen zwei Runden (0 = keine Pause)")
+    parser.add_argument("--metrics", type=float, nargs="?", const=10, default=None, metavar="SEKUNDEN",
+                        help="Zähler und Latenzen erfassen und alle SEKUNDEN (Standard 10) in eine Datei pro Prozess schreiben")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Metriken des Servers zusätzlich unter http://127.0.0.1:PORT/metrics bereitstellen")
+    parser.add_argument("--profile", choices=metrics.PROFILERS, default=None,
+                        help="cprofile: cProfile des Hauptthreads, sample: Stichproben aller Threads (.prof/-Profil.txt)")
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default="text",
+                        help="text: lesbare Zeilen wie bisher, json: kompakte JSON-Zeilen mit Runde, Spieler und Feld")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
     # Wenn das Skript direkt ausgeführt wird, wird die `main()` Funktion aufgerufen
-    if len(sys.argv) > 1:
+    args = parse_args(sys.argv[1:])
+    if args.no_audio:
+        audio.disable()
+    if args.metrics is not None or args.metrics_port or args.profile:
+        # Über die Umgebung erben auch der Serverprozess und die Spieler-Terminals die Einstellungen.
+        metrics.enable(args.metrics, args.metrics_port, args.profile)
+    if args.player_args:
         # Wenn Argumente übergeben werden, wird angenommen, dass ein einzelner Spielerprozess gestartet wird
-        player_id = int(sys.argv[1])
-        num_players = int(sys.argv[2])
-        card_size = int(sys.argv[3])
-        player_name = sys.argv[4]
-        server_ip = sys.argv[5]
-        server_port = int(sys.argv[6])
-        words = read_words_from_file("words.txt")
-        player_process(player_id, num_players, card_size, words, player_name, server_ip, server_port)
+        player_id = int(args.player_args[0])
+        num_players = int(args.player_args[1])
+        card_size = int(args.player_args[2])
+        player_name = args.player_args[3]
+        server_ip = args.player_args[4]
+        server_port = int(args.player_args[5])
+        words = normalize_words(read_words_from_file("words.txt"))
+        player_process(player_id, num_players, card_size, words, player_name, server_ip, server_port, args.log_format,
+                       args.room)
     else:
         # Ansonsten wird die `main()` Funktion aufgerufen, um das Spiel für mehrere Spieler zu starten
-        main()
+        timing = RoundTiming(args.round_seconds, args.pause_seconds)
+        main(args.server_mode, args.no_audio, args.log_format, timing)
@@ -0,0 +1,280 @@
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime
+
+# Zähler und Latenz-Histogramme für Server und Spieler. Standardmäßig ausgeschaltet; dann kostet jeder Aufruf nur
+# eine Abfrage von _enabled. Eingeschaltet wird über `--metrics` (bzw. die Umgebungsvariablen unten, die auch an
+# Kindprozesse und Spieler-Terminals vererbt werden):
+#   BINGO_METRICS=<Sekunden>  Metriken erfassen und in diesem Abstand in <Zeit>-bingo-<Rolle>-Metriken.txt schreiben
+#   BINGO_METRICS_PORT=<Port> Server stellen die Metriken zusätzlich unter http://127.0.0.1:<Port>/metrics bereit
+#   BINGO_PROFILE=cprofile    cProfile für den Hauptthread, Ausgabe in <Zeit>-bingo-<Rolle>.prof
+#   BINGO_PROFILE=sample      Stichproben aller Threads alle 10 ms, Ausgabe in <Zeit>-bingo-<Rolle>-Profil.txt
+PROFILERS = ("cprofile", "sample")
+SAMPLE_INTERVAL = 0.01
+BUCKETS = 32  # Zweierpotenzen ab 1 µs, also bis etwa 71 Minuten.
+SUB_BUCKETS = 8  # Unterteilung jeder Zweierpotenz; damit liegen Perzentile auf wenige Prozent genau.
+
+_enabled = os.environ.get("BINGO_METRICS", "") != ""
+_lock = threading.Lock()
+_counters = Counter()
+_histograms = {}
+_started = time.monotonic()
+_role = None
+_dump_thread = None
+_stop = threading.Event()
+_http_server = None
+_profiler = None
+_sampler = None
+
+
+def _bucket_bounds(bucket):
+    # Untere und obere Grenze eines Buckets in Sekunden; die ersten SUB_BUCKETS Buckets fassen alles unter 1 µs.
+    exponent, sub = divmod(bucket, SUB_BUCKETS)
+    if exponent == 0:
+        return 0.0, 1e-6
+    base = 2.0 ** (exponent - 1) * 1e-6
+    return base * (1 + sub / SUB_BUCKETS), base * (1 + (sub + 1) / SUB_BUCKETS)
+
+
+class Histogram:
+    # Latenzen in Sekunden, einsortiert in Zweierpotenz-Buckets ab 1 µs, jede Zweierpotenz in SUB_BUCKETS gleich
+    # breite Teile zerlegt. Perzentile werden innerhalb des Buckets linear interpoliert.
+    def __init__(self):
+        self.buckets = [0] * ((BUCKETS + 1) * SUB_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, seconds):
+        micros = seconds * 1e6
+        if micros < 1:
+            bucket = 0
+        else:
+            mantissa, exponent = math.frexp(micros)  # micros = mantissa * 2^exponent mit 0.5 <= mantissa < 1.
+            bucket = exponent * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+        self.buckets[min(bucket, len(self.buckets) - 1)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        # Interpoliert im Bucket, in dem das Perzentil liegt; begrenzt auf den gemessenen Minimal- und Maximalwert.
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            if count and seen + count >= target:
+                lower, upper = _bucket_bounds(bucket)
+                return min(max(lower + (upper - lower) * (target - seen) / count, self.min), self.max)
+            seen += count
+        return self.max
+
+
+def enable(interval=None, port=None, profile=None):
+    # Schaltet die Erfassung ein und gibt die Einstellungen über die Umgebung an später gestartete Prozesse weiter.
+    global _enabled
+    _enabled = True
+    os.environ["BINGO_METRICS"] = str(interval or os.environ.get("BINGO_METRICS") or 10)
+    if port:
+        os.environ["BINGO_METRICS_PORT"] = str(port)
+    if profile:
+        if profile not in PROFILERS:
+            raise ValueError(f"Unbekannter Profiler: {profile}")
+        os.environ["BINGO_PROFILE"] = profile
+
+
+def is_enabled():
+    return _enabled
+
+
+def count(name, value=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] += value
+
+
+def observe(name, seconds):
+    if not _enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+
+class _Timer:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        observe(self.name, time.perf_counter() - self.started)
+
+
+_NULL_TIMER = nullcontext()
+
+
+def timer(name):
+    # with metrics.timer("render"): ...  misst die Dauer des Blocks; ausgeschaltet ein gemeinsamer Leer-Kontext.
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def snapshot():
+    # Kopie aller Werte: {"counters": {Name: Wert}, "histograms": {Name: {count, sum, p50, p90, p99, max}}}.
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "histograms": {name: {"count": histogram.count, "sum": histogram.sum,
+                                  "p50": histogram.percentile(0.5), "p90": histogram.percentile(0.9),
+                                  "p99": histogram.percentile(0.99), "max": histogram.max}
+                           for name, histogram in _histograms.items()},
+        }
+
+
+def format_text():
+    # Klartext im Stil von Prometheus: eine Zeile pro Wert, Zeiten in Sekunden.
+    data = snapshot()
+    lines = [f"# Bingo-Metriken {_role or ''} nach {time.monotonic() - _started:.1f} s"]
+    for name, value in sorted(data["counters"].items()):
+        lines.append(f"{name}_total {value}")
+    for name, values in sorted(data["histograms"].items()):
+        lines.append(f"{name}_count {values['count']}")
+        for key in ("sum", "p50", "p90", "p99", "max"):
+            lines.append(f"{name}_{key}_seconds {values[key]:.6f}")
+    return "\n".join(lines) + "\n"
+
+
+def _file_name(role, suffix):
+    return f"{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}-bingo-{role}{suffix}"
+
+
+def _write_dump(path):
+    temporary = path + ".tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(format_text())
+    os.replace(temporary, path)  # Leser sehen nie eine halb geschriebene Datei.
+
+
+def _dump_loop(path, interval):
+    while not _stop.wait(interval):
+        _write_dump(path)
+
+
+def _http_server_for(port):
+    # http.server wird erst hier importiert; der Import kostet mehr als der Rest des Spiels zusammen.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = format_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keine Zugriffszeilen im Terminal (würden die curses-Anzeige stören).
+
+    return ThreadingHTTPServer(('127.0.0.1', port), MetricsHandler)
+
+
+class _Sampler:
+    # Stichproben-Profiler: Zählt alle SAMPLE_INTERVAL Sekunden die gerade ausgeführte Funktion jedes Threads.
+    # Erfasst anders als cProfile auch die Verbindungs- und Log-Threads.
+    def __init__(self):
+        self.samples = Counter()
+        self.thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not _stop.wait(SAMPLE_INTERVAL):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own:
+                    code = frame.f_code
+                    self.samples[f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"] += 1
+
+    def write(self, path):
+        total = sum(self.samples.values()) or 1
+        with open(path, 'w', encoding='utf-8') as f:
+            for name, samples in self.samples.most_common(50):
+                f.write(f"{samples:8d} {samples * 100 / total:6.2f} % {name}\n")
+
+
+def start(role, serve_http=False):
+    # Startet für diesen Prozess die periodische Ausgabe, ggf. den HTTP-Endpunkt (nur Server) und den Profiler.
+    global _role, _dump_thread, _http_server, _profiler, _sampler
+    if not _enabled:
+        return
+    _role = role
+    _stop.clear()
+    interval = float(os.environ.get("BINGO_METRICS") or 10)
+    path = _file_name(role, "-Metriken.txt")
+    _dump_thread = threading.Thread(target=_dump_loop, args=(path, interval), name="metrics-dump", daemon=True)
+    _dump_thread.path = path
+    _dump_thread.start()
+
+    port = os.environ.get("BINGO_METRICS_PORT")
+    if serve_http and port:
+        try:
+            _http_server = _http_server_for(int(port))
+        except OSError:
+            _http_server = None  # Port belegt; die Metriken stehen weiterhin in der Datei.
+        else:
+            threading.Thread(target=_http_server.serve_forever, name="metrics-http", daemon=True).start()
+
+    profile = os.environ.get("BINGO_PROFILE")
+    if profile == "cprofile":
+        import cProfile  # Nur bei Bedarf importieren, damit der Start des Spiels schnell bleibt.
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    elif profile == "sample":
+        _sampler = _Sampler()
+
+
+def stop():
+    # Schreibt die letzten Werte und die Profile und beendet die Hintergrund-Threads.
+    global _dump_thread, _http_server, _profiler, _sampler
+    if _dump_thread is None:
+        return
+    _stop.set()
+    _dump_thread.join()
+    _write_dump(_dump_thread.path)
+    _dump_thread = None
+    if _http_server is not None:
+        _http_server.shutdown()
+        _http_server.server_close()
+        _http_server = None
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(_file_name(_role, ".prof"))
+        _profiler = None
+    if _sampler is not None:
+        _sampler.thread.join()
+        _sampler.write(_file_name(_role, "-Profil.txt"))
+        _sampler = None
@@ -0,0 +1,119 @@
+import json
+import struct
+from collections import namedtuple
+
+# Nachrichtentypen des Spielprotokolls.
+DRAW = 1   # Server -> Spieler: gezogenes Wort der Runde.
+MARK = 2   # Spieler -> Server: Spieler hat das Wort der Runde markiert.
+WIN = 3    # Beide Richtungen: Spieler meldet Bingo bzw. Server verkündet den Gewinner.
+STATE = 4  # Server -> Spieler: Zustandsmeldung (z.B. zugewiesene Spieler-ID).
+ACK = 5    # Spieler -> Server: Spieler hat die Runde ohne Markierung abgeschlossen.
+JOIN = 6   # Spieler -> Lobby: Beitritt zu einem Spielraum (JSON mit Raum und Name), Antwort ist eine STATE-Nachricht.
+
+MESSAGE_TYPES = {DRAW: "DRAW", MARK: "MARK", WIN: "WIN", STATE: "STATE", ACK: "ACK", JOIN: "JOIN"}
+
+# Jeder Frame beginnt mit Nutzlastlänge (4 Byte), Nachrichtentyp (1 Byte) und Rundennummer (4 Byte), Network Byte Order.
+HEADER = struct.Struct("!IBI")
+MAX_PAYLOAD = 64 * 1024  # Schutz vor beschädigten oder bösartigen Längenangaben.
+RECV_SIZE = 64 * 1024
+
+Message = namedtuple("Message", ["type", "seq", "payload"])
+
+
+def encode_message(msg_type, seq, payload=""):
+    # Kodiert eine Nachricht als Frame mit Längenpräfix; die Nutzlast wird als UTF-8 übertragen.
+    data = payload.encode('utf-8')
+    if len(data) > MAX_PAYLOAD:
+        raise ValueError(f"Nutzlast zu groß: {len(data)} Bytes")
+    return HEADER.pack(len(data), msg_type, seq) + data
+
+
+def encode_batch(messages):
+    # Kodiert mehrere (Typ, Sequenz, Nutzlast)-Tupel in einen Puffer, der mit einem einzigen Systemaufruf gesendet wird.
+    return b"".join(encode_message(*message) for message in messages)
+
+
+class FrameDecoder:
+    # Setzt Frames aus einem Bytestrom wieder zusammen, egal wie TCP die Daten aufteilt oder zusammenfasst.
+    # Die Nutzlast wird erst dekodiert, wenn der Frame vollständig ist, daher werden auch Umlaute nie zerteilt.
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        # Hängt empfangene Bytes an und liefert alle darin vollständig enthaltenen Nachrichten.
+        buffer = self.buffer
+        buffer += data
+        messages = []
+        offset = 0
+        while len(buffer) - offset >= HEADER.size:
+            length, msg_type, seq = HEADER.unpack_from(buffer, offset)
+            if length > MAX_PAYLOAD or msg_type not in MESSAGE_TYPES:
+                raise ValueError(f"Ungültiger Frame: Typ {msg_type}, Länge {length}")
+            end = offset + HEADER.size + length
+            if end > len(buffer):
+                break  # Der Rest des Frames ist noch unterwegs.
+            messages.append(Message(msg_type, seq, buffer[offset + HEADER.size:end].decode('utf-8')))
+            offset = end
+        del buffer[:offset]
+        return messages
+
+
+def send_messages(sock, messages):
+    sock.sendall(encode_batch(messages))  # Alle Nachrichten in einem Aufruf senden.
+
+
+def recv_messages(sock, decoder):
+    # Liest verfügbare Bytes vom Socket und gibt die vollständigen Nachrichten zurück.
+    # Bei nicht blockierenden Sockets wird BlockingIOError wie bei recv() weitergereicht.
+    data = sock.recv(RECV_SIZE)
+    if not data:
+        raise ConnectionError("Die Verbindung wurde von der Gegenseite geschlossen.")
+    return decoder.feed(data)
+
+
+async def read_messages(reader, decoder):
+    # asyncio-Gegenstück zu recv_messages für StreamReader.
+    data = await reader.read(RECV_SIZE)
+    if not data:
+        raise ConnectionError("Die Verbindung wurde von der Gegenseite geschlossen.")
+    return decoder.feed(data)
+
+
+def encode_state(seq, **fields):
+    # STATE-Nachrichten tragen ein JSON-Objekt, z.B. die vom Server zugeteilte Karte.
+    return encode_message(STATE, seq, json.dumps(fields, ensure_ascii=False, separators=(",", ":")))
+
+
+def encode_join(room, name, player_id=None):
+    # Erste Nachricht eines Spielers: an die Lobby mit Raum-ID (siehe lobby.py), direkt an den Server mit der
+    # Spieler-ID aus dem Start des Spielers.
+    fields = {"room": room, "name": name} if room is not None else {"name": name}
+    if player_id is not None:
+        fields["player_id"] = player_id
+    return encode_message(JOIN, 0, json.dumps(fields, ensure_ascii=False, separators=(",", ":")))
+
+
+def decode_state(message):
+    return json.loads(message.payload)
+
+
+def join_player_id(message, player_names, taken):
+    # Wählt die Spieler-ID (0-basiert) einer direkten Verbindung zum Server. Die Reihenfolge der Verbindungen ist
+    # zufällig, daher gilt die ID aus der JOIN-Nachricht, sonst die erste freie ID mit dem gesendeten Namen, sonst
+    # die erste freie ID. taken enthält die vergebenen IDs; None, wenn alle Plätze belegt sind.
+    request = {}
+    if message is not None and message.type == JOIN:
+        try:
+            request = decode_state(message)
+        except ValueError:
+            pass
+    if not isinstance(request, dict):
+        request = {}
+    player_id = request.get("player_id")
+    if type(player_id) is int and 0 <= player_id < len(player_names) and player_id not in taken:
+        return player_id
+    name = request.get("name")
+    for candidate, candidate_name in enumerate(player_names):
+        if candidate_name == name and candidate not in taken:
+            return candidate
+    return next((candidate for candidate in range(len(player_names)) if candidate not in taken), None)
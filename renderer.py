@@ -0,0 +1,121 @@
+import curses
+
+CELL_WIDTH = 20  # Fixed width for each cell
+
+# Farbpaare der Spieleransicht (siehe player_process).
+NORMAL_PAIR = 2
+CURSOR_PAIR = 3
+MARKED_PAIR = 4
+BORDER_PAIR = 5
+
+
+def cell_label(card, y, x):
+    # Text eines Feldes: markierte Wörter bekommen ein "X" vorangestellt, zu lange Wörter werden gekürzt.
+    word = card.word_at(y, x)
+    if card.is_marked(y, x):
+        word = "X " + word
+    if len(word) > CELL_WIDTH - 1:
+        word = word[:CELL_WIDTH - 2] + '…'
+    return word
+
+
+class CardRenderer:
+    # Differenzielles Zeichnen der Bingo-Karte: Der Renderer merkt sich den zuletzt gezeichneten Zustand
+    # (Cursor und Markierungs-Bitmaske der Karte) und zeichnet nur Felder neu, die sich geändert haben.
+    # Eine Cursorbewegung kostet damit zwei Felder, eine Markierung eines. Ausgegeben wird gesammelt über
+    # noutrefresh()/doupdate().
+    #
+    # Kostenzähler: addstr_calls und bytes_written (gesamt) sowie last_addstr_calls und last_bytes_written
+    # (letzter Frame).
+    def __init__(self, window, size, start_y, start_x, color_pair=curses.color_pair, doupdate=curses.doupdate):
+        self.window = window
+        self.size = size
+        self.start_y = start_y
+        self.start_x = start_x
+        self.color_pair = color_pair
+        self.doupdate = doupdate
+        self.lines = {}  # (y, x) -> (Text, Farbpaar) der zuletzt gezeichneten Statuszeilen.
+        self.frames = 0
+        self.addstr_calls = 0
+        self.bytes_written = 0
+        self.last_addstr_calls = 0
+        self.last_bytes_written = 0
+        self._pending_calls = 0
+        self._pending_bytes = 0
+        self.invalidate()
+
+    def invalidate(self):
+        # Erzwingt beim nächsten render() ein vollständiges Neuzeichnen (z.B. nach window.clear()).
+        self.drawn = False
+        self.cursor = None
+        self.marked = 0
+        self.lines.clear()
+
+    def _addstr(self, y, x, text, pair=None):
+        if pair is None:
+            self.window.addstr(y, x, text)
+        else:
+            self.window.addstr(y, x, text, self.color_pair(pair))
+        self._pending_calls += 1
+        self._pending_bytes += len(text.encode('utf-8'))
+
+    def _draw_cell(self, card, y, x, cursor):
+        if (y, x) == cursor:
+            pair = CURSOR_PAIR
+        elif card.is_marked(y, x):
+            pair = MARKED_PAIR
+        else:
+            pair = NORMAL_PAIR
+        # Genau CELL_WIDTH Zeichen, damit der linke Rand des Nachbarfeldes nicht überschrieben wird.
+        text = f"| {cell_label(card, y, x):<{CELL_WIDTH - 1}}"[:CELL_WIDTH]
+        self._addstr(self.start_y + y * 2, self.start_x + x * CELL_WIDTH, text, pair)
+
+    def draw_line(self, y, x, text, pair):
+        # Zeichnet eine Text-Zeile außerhalb der Karte (z.B. die Frage nach dem Wort), nur wenn sie sich geändert hat.
+        if self.lines.get((y, x)) == (text, pair):
+            return
+        self.window.move(y, x)
+        self.window.clrtoeol()
+        self._addstr(y, x, text, pair)
+        self.lines[(y, x)] = (text, pair)
+
+    def render(self, card, cursor_y=None, cursor_x=None):
+        # Zeichnet die Änderungen seit dem letzten Frame und gibt (addstr-Aufrufe, Bytes) dieses Frames zurück.
+        size = self.size
+        cursor = (cursor_y, cursor_x) if cursor_y is not None and cursor_x is not None else None
+        if not self.drawn:
+            for y in range(size):
+                for x in range(size):
+                    self._draw_cell(card, y, x, cursor)
+                self._addstr(self.start_y + y * 2, self.start_x + size * CELL_WIDTH, "|")
+            self._addstr(self.start_y + size * 2, self.start_x,
+                         "+" + "-" * (CELL_WIDTH * size + size - 1) + "+", BORDER_PAIR)
+            self.drawn = True
+        else:
+            dirty = set()
+            if cursor != self.cursor:
+                dirty.update(cell for cell in (self.cursor, cursor) if cell is not None)
+            changed = card.marked ^ self.marked  # Bits der seit dem letzten Frame markierten Felder.
+            while changed:
+                bit = changed & -changed
+                dirty.add(divmod(bit.bit_length() - 1, size))
+                changed ^= bit
+            for y, x in dirty:
+                self._draw_cell(card, y, x, cursor)
+        self.cursor = cursor
+        self.marked = card.marked
+        return self.flush()
+
+    def flush(self):
+        # Gibt alle gesammelten Änderungen mit einem einzigen doupdate() aus.
+        calls, written = self._pending_calls, self._pending_bytes
+        if calls:
+            self.window.noutrefresh()
+            self.doupdate()
+        self._pending_calls = self._pending_bytes = 0
+        self.frames += 1
+        self.addstr_calls += calls
+        self.bytes_written += written
+        self.last_addstr_calls = calls
+        self.last_bytes_written = written
+        return calls, written
@@ -0,0 +1,394 @@
+# Wiedergabe aufgezeichneter Spiele aus den Logdateien (Text- und JSON-Format, siehe game_log.py).
+# Die Logs werden zeilenweise gestreamt und der Zustand (gezogene Wörter, Karte, Markierungen, Sieg) inkrementell
+# aufgebaut. Ein Index mit dem Dateioffset jeder Runde und regelmäßigen Zustands-Checkpoints erlaubt den Sprung zu
+# Runde K, ohne die Datei von vorne zu lesen. Damit lassen sich Siege nachprüfen und Partien ohne Oberfläche abspielen.
+#
+# Aufruf:  python replay.py --verify 2024-*-bingo-*.txt
+#          python replay.py --round 12 2024-06-01-12-00-00-bingo-Spieler1.jsonl
+#          python replay.py --play --speed 10 2024-06-01-12-00-00-bingo-Master.txt
+import argparse
+import json
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from main import BingoCard
+
+INDEX_INTERVAL = 16  # Alle so viele Runden speichert der Index einen vollständigen Zustand.
+
+TEXT_LINE = re.compile(r"(\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2}) (.*)")
+DRAW_EVENT = re.compile(r"Runde (\d+): Das gezogene Wort lautet: (.*)")
+SIZE_EVENT = re.compile(r"Größe des Spielfelds: \((\d+)x\d+\)")
+CARD_EVENT = re.compile(r"Karte von (.*?): (\[\[.*\]\])")
+MARK_EVENT = re.compile(r"(.*) \((\d+),(\d+)\)")  # "<Wort> (x,y)" wie in player_process.
+WIN_EVENT = re.compile(r"(.*) hat gewonnen!")
+SIMPLE_EVENTS = {
+    "Start des Spiels": "start",
+    "Ende des Spiels": "end",
+    "Sieg": "claim",  # Der Spieler hat selbst Bingo gemeldet (in älteren Logs auch bei fremden Siegen, s. apply()).
+    "Kein Gewinner": "no_winner",
+    "Alle Wörter wurden gezogen, es gibt keinen Gewinner.": "no_winner",
+    "Abbruch": "abort",
+    "Verbindung zum Server getrennt": "disconnect",
+}
+
+# Ein Logeintrag: kind ist "draw", "size", "card", "mark", "claim", "win", "no_winner", "start", "end", "abort",
+# "disconnect" oder "other". value ist je nach Art das Wort, die Kartengröße, die Zeilen der Karte oder der Name.
+LogEntry = namedtuple("LogEntry", ["time", "kind", "round", "player", "value", "cell", "text"])
+
+_timestamps = {}  # Zwischenspeicher für geparste Text-Zeitstempel (viele Zeilen teilen sich eine Sekunde).
+
+
+def _text_time(text):
+    timestamp = _timestamps.get(text)
+    if timestamp is None:
+        if len(_timestamps) > 100000:
+            _timestamps.clear()
+        timestamp = _timestamps[text] = datetime.strptime(text, "%Y-%m-%d-%H-%M-%S").timestamp()
+    return timestamp
+
+
+def parse_line(line):
+    # Zerlegt eine Zeile im Text- oder JSON-Format. Gibt None für leere oder unlesbare Zeilen zurück.
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            record = json.loads(line)
+            timestamp, event = record.get("mono", record.get("ts")), record["event"]
+        except (ValueError, KeyError):
+            return None
+        round_count, player, cell = record.get("round"), record.get("player"), record.get("cell")
+        cell = tuple(cell) if cell is not None else None
+    else:
+        match = TEXT_LINE.fullmatch(line)
+        if match is None:
+            return None
+        timestamp, event = _text_time(match.group(1)), match.group(2)
+        round_count = player = cell = None
+
+    kind = SIMPLE_EVENTS.get(event)
+    if kind is not None:
+        return LogEntry(timestamp, kind, round_count, player, None, cell, event)
+    match = DRAW_EVENT.fullmatch(event)
+    if match:
+        return LogEntry(timestamp, "draw", int(match.group(1)), player, match.group(2), cell, event)
+    match = SIZE_EVENT.fullmatch(event)
+    if match:
+        return LogEntry(timestamp, "size", round_count, player, int(match.group(1)), cell, event)
+    match = CARD_EVENT.fullmatch(event)
+    if match:
+        try:
+            rows = json.loads(match.group(2))
+        except ValueError:
+            rows = None
+        if rows is not None:
+            return LogEntry(timestamp, "card", round_count, player, (match.group(1), rows), cell, event)
+    match = MARK_EVENT.fullmatch(event)
+    if match:
+        cell = cell or (int(match.group(3)), int(match.group(2)))  # Der Text nennt (x,y), das Feld ist (y, x).
+        return LogEntry(timestamp, "mark", round_count, player, match.group(1), cell, event)
+    match = WIN_EVENT.fullmatch(event)
+    if match:
+        return LogEntry(timestamp, "win", round_count, player, match.group(1), cell, event)
+    return LogEntry(timestamp, "other", round_count, player, None, cell, event)
+
+
+def read_entries(path, offset=0):
+    # Streamt (Offset, LogEntry) ab dem Byte-Offset offset, ohne die Datei vollständig einzulesen.
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            entry = parse_line(line.decode('utf-8', errors='replace'))
+            if entry is not None:
+                yield offset, entry
+            offset += len(line)
+
+
+class ReplayState:
+    # Inkrementell aufgebauter Zustand eines Logs (Master oder Spieler). apply() verarbeitet einen Eintrag in O(1);
+    # Unstimmigkeiten (Markierung eines nicht gezogenen Wortes, falsches Feld, doppelte Ziehung) landen in errors.
+    def __init__(self):
+        self.round_count = 0
+        self.drawn_words = []
+        self.drawn_rounds = {}  # Wort -> Runde der Ziehung.
+        self.name = None
+        self.player = None
+        self.card = None
+        self.marks = []  # (Runde, Wort, (y, x)) in der Reihenfolge der Markierungen.
+        self.claimed_round = None  # Runde, in der der Spieler selbst Bingo gemeldet hat.
+        self.claim_valid = False  # Ob die Karte zum Zeitpunkt der Meldung tatsächlich Bingo hatte.
+        self.card_logged = False  # Ob das Log die Karte enthält (neueres Format).
+        self.unclear_claim = False  # "Sieg" in einem älteren Log, der nicht die eigene Meldung sein muss.
+        self.winner = None  # Name des verkündeten Gewinners, "" ohne Gewinner, None solange offen.
+        self.ended = False
+        self.errors = []
+
+    def apply(self, entry):
+        kind = entry.kind
+        if entry.player is not None:
+            self.player = entry.player
+        if kind == "draw":
+            if entry.round != self.round_count + 1:
+                self.errors.append(f"Runde {entry.round} folgt auf Runde {self.round_count}")
+            if entry.value in self.drawn_rounds:
+                self.errors.append(f"Runde {entry.round}: {entry.value} wurde bereits gezogen")
+            self.round_count = entry.round
+            self.drawn_words.append(entry.value)
+            self.drawn_rounds.setdefault(entry.value, entry.round)
+        elif kind == "card":
+            self.name, rows = entry.value
+            self.card = BingoCard(rows)
+            self.card_logged = True
+        elif kind == "size":
+            if self.card is None:
+                # Ältere Logs enthalten die Karte nicht; die Wörter ergeben sich dann aus den Markierungen.
+                self.card = BingoCard([[""] * entry.value for _ in range(entry.value)])
+        elif kind == "mark":
+            self._mark(entry)
+        elif kind == "claim":
+            old_format = not self.drawn_words and not self.card_logged
+            if old_format and not (self.card is not None and self.card.has_bingo()):
+                # Ältere player_process-Versionen schrieben "Sieg" in das Log jedes Spielers, sobald der Server einen
+                # Gewinner verkündete. Ohne Bingo auf der rekonstruierten Karte ist das kein strittiger Sieg, sondern
+                # vermutlich das Spielende durch den Sieg eines anderen.
+                self.unclear_claim = True
+                self.ended = True
+            elif self.claimed_round is None:
+                self.claimed_round = entry.round if entry.round is not None else self.round_count
+                self.claim_valid = self.card is not None and self.card.has_bingo()
+        elif kind == "win":
+            self.winner = entry.value
+        elif kind == "no_winner":
+            self.winner = ""
+        elif kind == "end":
+            self.ended = True
+
+    def _mark(self, entry):
+        round_count = entry.round if entry.round is not None else self.round_count
+        word, (y, x) = entry.value, entry.cell
+        card = self.card
+        if card is None or not (0 <= y < card.size and 0 <= x < card.size):
+            self.errors.append(f"Runde {round_count}: Feld ({x},{y}) liegt nicht auf der Karte")
+            return
+        if card.cells[y][x] == "":
+            card.cells[y][x] = word  # Karte aus dem Log rekonstruieren.
+            card.index.setdefault(word, (y, x))
+        elif card.cells[y][x] != word:
+            self.errors.append(f"Runde {round_count}: ({x},{y}) enthält {card.cells[y][x]}, nicht {word}")
+            return
+        drawn_round = self.drawn_rounds.get(word)
+        if self.drawn_words and (drawn_round is None or drawn_round > round_count):
+            self.errors.append(f"Runde {round_count}: {word} wurde bis dahin nicht gezogen")
+            return
+        if not card.mark(y, x):
+            self.errors.append(f"Runde {round_count}: ({x},{y}) wurde doppelt markiert")
+            return
+        self.marks.append((round_count, word, (y, x)))
+
+    def verified(self):
+        # Ein Sieg gilt als bestätigt, wenn die Karte bei der Meldung Bingo hatte und alle Markierungen stimmen.
+        return self.claimed_round is not None and self.claim_valid and not self.errors
+
+    def checkpoint(self):
+        # Kompakter, JSON-fähiger Zustand für den Index.
+        return {
+            "round": self.round_count, "drawn": list(self.drawn_words), "name": self.name, "player": self.player,
+            "cells": self.card.cells if self.card is not None else None,
+            "marks": [[round_count, word, list(cell)] for round_count, word, cell in self.marks],
+            "claimed": self.claimed_round, "claim_valid": self.claim_valid, "winner": self.winner,
+            "ended": self.ended, "errors": list(self.errors), "card_logged": self.card_logged,
+            "unclear_claim": self.unclear_claim,
+        }
+
+    @classmethod
+    def restore(cls, checkpoint):
+        state = cls()
+        state.round_count = checkpoint["round"]
+        state.drawn_words = list(checkpoint["drawn"])
+        for round_count, word in enumerate(state.drawn_words, start=1):
+            state.drawn_rounds.setdefault(word, round_count)
+        state.name, state.player = checkpoint["name"], checkpoint["player"]
+        if checkpoint["cells"] is not None:
+            state.card = BingoCard(checkpoint["cells"])
+            for _, _, (y, x) in checkpoint["marks"]:
+                state.card.mark(y, x)
+        state.marks = [(round_count, word, tuple(cell)) for round_count, word, cell in checkpoint["marks"]]
+        state.claimed_round, state.claim_valid = checkpoint["claimed"], checkpoint["claim_valid"]
+        state.winner, state.ended, state.errors = checkpoint["winner"], checkpoint["ended"], list(checkpoint["errors"])
+        state.card_logged = checkpoint.get("card_logged", False)  # Fehlt in früher gespeicherten Indizes.
+        state.unclear_claim = checkpoint.get("unclear_claim", False)
+        return state
+
+
+class GameReplay:
+    # Eine aufgezeichnete Partie. Der Index (Offset jeder Runde und alle INDEX_INTERVAL Runden ein Checkpoint)
+    # wird beim ersten Sprung in einem Durchlauf erstellt und auf Wunsch neben dem Log gespeichert (<Log>.idx).
+    def __init__(self, path, save_index=False):
+        self.path = path
+        self.save_index = save_index
+        self.offsets = None  # offsets[k - 1] = Byte-Offset der Ziehung von Runde k.
+        self.checkpoints = None  # Runde -> Checkpoint des Zustands vor dieser Runde.
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def build_index(self):
+        if self.offsets is not None:
+            return
+        index_path = self.path + ".idx"
+        try:
+            with open(index_path, encoding='utf-8') as f:
+                index = json.load(f)
+            if index["stat"] == self._stat():
+                self.offsets = index["offsets"]
+                self.checkpoints = {int(round_count): checkpoint
+                                    for round_count, checkpoint in index["checkpoints"].items()}
+                return
+        except (OSError, ValueError, KeyError):
+            pass  # Kein oder veralteter Index: neu aufbauen.
+
+        state = ReplayState()
+        self.offsets, self.checkpoints = [], {}
+        for offset, entry in read_entries(self.path):
+            if entry.kind == "draw":
+                self.offsets.append(offset)
+                if entry.round % INDEX_INTERVAL == 0:
+                    self.checkpoints[entry.round] = state.checkpoint()
+            state.apply(entry)
+        if self.save_index:
+            try:
+                with open(index_path, 'w', encoding='utf-8') as f:
+                    json.dump({"stat": self._stat(), "offsets": self.offsets, "checkpoints": self.checkpoints}, f,
+                              ensure_ascii=False, separators=(",", ":"))
+            except OSError:
+                pass  # Z.B. schreibgeschütztes Archiv; der Index gilt dann nur für diesen Lauf.
+
+    def entries(self, from_round=0):
+        # Streamt die Einträge ab der Ziehung von Runde from_round (0 = ab Dateianfang).
+        offset = 0
+        if from_round > 0:
+            self.build_index()
+            if from_round > len(self.offsets):
+                return
+            offset = self.offsets[from_round - 1]
+        for _, entry in read_entries(self.path, offset):
+            yield entry
+
+    def state_at(self, round_count):
+        # Zustand am Ende von Runde round_count: Vom nächsten Checkpoint aus werden höchstens INDEX_INTERVAL Runden
+        # gelesen statt der ganzen Datei.
+        self.build_index()
+        start = max([k for k in self.checkpoints if k <= round_count + 1], default=0)
+        state = ReplayState.restore(self.checkpoints[start]) if start else ReplayState()
+        for entry in self.entries(start):
+            if entry.kind == "draw" and entry.round > round_count:
+                break
+            state.apply(entry)
+        return state
+
+    def replay(self, from_round=0, speed=None, on_entry=None):
+        # Spielt die Partie ab from_round ab. Ohne speed so schnell wie möglich, sonst mit den aufgezeichneten
+        # Abständen geteilt durch speed. Gibt den Endzustand zurück.
+        if from_round <= 1:
+            from_round = 0  # Ab Runde 1 heißt: samt Kopf (Karte, Kartengröße) vom Dateianfang.
+        state = self.state_at(from_round - 1) if from_round else ReplayState()
+        previous = None
+        for entry in self.entries(from_round):
+            if speed and previous is not None and entry.time > previous:
+                time.sleep((entry.time - previous) / speed)
+            previous = entry.time
+            state.apply(entry)
+            if on_entry is not None:
+                on_entry(entry, state)
+        return state
+
+
+def verify_log(path):
+    # Spielt ein Log ohne Index in einem Durchlauf ab und fasst das Ergebnis zusammen.
+    state = ReplayState()
+    for _, entry in read_entries(path):
+        state.apply(entry)
+    return {
+        "path": path, "name": state.name, "player": state.player, "rounds": state.round_count,
+        "claimed": state.claimed_round, "verified": state.verified(), "winner": state.winner,
+        "errors": state.errors, "draws_checked": bool(state.drawn_words), "unclear": state.unclear_claim,
+    }
+
+
+def verify_logs(paths, workers=None):
+    # Prüft viele Logs parallel; Master-Logs (ohne Karte) liefern den verkündeten Gewinner, Spieler-Logs die Meldung.
+    if workers == 1 or len(paths) < 2:
+        return [verify_log(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(verify_log, paths, chunksize=16))
+
+
+def format_result(result):
+    if result["claimed"] is not None:
+        status = "bestätigt" if result["verified"] else "NICHT bestätigt"
+        if result["verified"] and not result["draws_checked"]:
+            status += " (ältere Logs enthalten keine Ziehungen; nur die Karte wurde geprüft)"
+        text = f"Bingo in Runde {result['claimed']} {status}"
+    elif result["unclear"]:
+        text = ("Spielende unklar (älteres Log: \"Sieg\" ohne Bingo auf der eigenen Karte,"
+                " vermutlich Sieg eines anderen)")
+    elif result["winner"]:
+        text = f"{result['winner']} hat gewonnen"
+    elif result["winner"] == "":
+        text = "kein Gewinner"
+    else:
+        text = "kein Sieg gemeldet"
+    text = f"{result['path']}: {result['rounds']} Runden, {text}"
+    return "\n".join([text] + [f"  {error}" for error in result["errors"]])
+
+
+def print_state(state):
+    print(f"Runde {state.round_count}, zuletzt gezogen: {state.drawn_words[-1] if state.drawn_words else '-'}")
+    if state.card is not None:
+        for y, row in enumerate(state.card.cells):
+            print(" | ".join(("X " if state.card.is_marked(y, x) else "  ") + (word or "?")
+                             for x, word in enumerate(row)))
+    for error in state.errors:
+        print(f"  {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wiedergabe und Prüfung aufgezeichneter Bingo-Partien")
+    parser.add_argument("logs", nargs="+")
+    parser.add_argument("--verify", action="store_true", help="Siege aller Logs nachprüfen (Standard)")
+    parser.add_argument("--round", type=int, default=None, help="Zustand am Ende dieser Runde anzeigen")
+    parser.add_argument("--play", action="store_true", help="Ereignisse ab --round bzw. vom Anfang ausgeben")
+    parser.add_argument("--speed", type=float, default=None, help="Wiedergabe mit aufgezeichneten Abständen / speed")
+    parser.add_argument("--save-index", action="store_true", help="Rundenindex als <Log>.idx neben dem Log speichern")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.play:
+        for path in args.logs:
+            replay = GameReplay(path, args.save_index)
+            state = replay.replay(args.round or 0, args.speed, lambda entry, state: print(entry.text))
+            print_state(state)
+    elif args.round is not None:
+        for path in args.logs:
+            print_state(GameReplay(path, args.save_index).state_at(args.round))
+    else:
+        results = verify_logs(args.logs, args.workers)
+        for result in results:
+            print(format_result(result))
+        # Gleicht die von Master-Logs verkündeten Gewinner mit den Meldungen in den Spieler-Logs ab.
+        claims = {result["name"]: result for result in results if result["name"] is not None}
+        for result in results:
+            if result["winner"] and result["name"] is None and result["winner"] in claims:
+                claim = claims[result["winner"]]
+                status = "bestätigt" if claim["verified"] else "NICHT bestätigt"
+                print(f"{result['path']}: Sieg von {result['winner']} laut {claim['path']} {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import random
+from collections import namedtuple
+
+# Zeitvorgaben einer Runde in Sekunden. Alle Werte dürfen 0 sein (schnelles Spiel oder Turniere).
+#   round_seconds:   maximale Dauer einer Runde; sie endet früher, wenn alle Spieler geantwortet haben oder jemand gewinnt
+#   pause_seconds:   Pause zwischen zwei Runden
+#   warning_seconds: ab dieser Restzeit wird der Countdown-Sound gespielt
+RoundTiming = namedtuple("RoundTiming", ["round_seconds", "pause_seconds", "warning_seconds"],
+                         defaults=[30, 4, 10])
+
+
+class DrawScheduler:
+    # Zieht Wörter ohne Wiederholung aus einer vorab gemischten Permutation: jede Ziehung kostet O(1),
+    # und wenn alle Wörter gezogen sind, liefert draw() None statt endlos weiterzusuchen.
+    def __init__(self, words, seed=None):
+        self.order = list(dict.fromkeys(words))  # Doppelte Einträge würden sonst zweimal gezogen.
+        random.Random(seed).shuffle(self.order)
+        self.position = 0
+
+    def draw(self):
+        if self.position >= len(self.order):
+            return None  # Ende des Stapels.
+        word = self.order[self.position]
+        self.position += 1
+        return word
+
+    def remaining(self):
+        return len(self.order) - self.position
+
+    def drawn(self):
+        return self.order[:self.position]
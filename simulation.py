@@ -0,0 +1,140 @@
+# Headless-Simulation: spielt Bingo-Partien ohne curses, Sound, Timer oder Sockets,
+# um z.B. zu beantworten, wie viele Runden eine Partie mit 12 Spielern auf 5x5-Karten dauert.
+#
+# Aufruf:  python simulation.py --games 1000000 --players 12 --size 5 --seed 1
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from main import read_words_from_file, create_bingo_card, mark_word_on_card, check_winner
+
+DEFAULT_CHUNK_SIZE = 5000  # Partien pro Arbeitspaket; bestimmt zusammen mit dem Seed das Ergebnis.
+
+
+def simulate_game_reference(words, num_players, size, rng=random, cards=None, draws=None):
+    # Referenz: spielt eine Partie Wort für Wort mit create_bingo_card, mark_word_on_card und check_winner.
+    # Mit cards (BingoCards) und draws (Reihenfolge der Wörter) wird eine vorgegebene Partie gespielt, z.B. um
+    # simulate_batch zu prüfen. Gibt die Runde des ersten Bingos und die Liste der Gewinner (0-basiert) zurück.
+    vocabulary = list(dict.fromkeys(words))
+    if cards is None:
+        cards = [create_bingo_card(vocabulary, size) for _ in range(num_players)]
+    if draws is None:
+        draws = rng.sample(vocabulary, len(vocabulary))
+    for round_count, drawn_word in enumerate(draws, start=1):
+        for card in cards:
+            position = card.find(drawn_word)
+            if position is not None:
+                mark_word_on_card(card, *position)
+        winners = [player for player, card in enumerate(cards) if check_winner(card, size)]
+        if winners:
+            return round_count, winners
+    return len(draws), []
+
+
+def simulate_batch(num_games, num_players, size, vocabulary_size, seed, cards=None, order=None):
+    # Vektorisiert: Karten sind Matrizen aus Wort-IDs, die Ziehung ist eine Permutation der IDs.
+    # Statt Runde für Runde zu markieren, wird für jedes Feld die Runde bestimmt, in der sein Wort gezogen wird.
+    # Eine Linie ist in der Runde komplett, in der ihr letztes Feld gezogen wird (Maximum), eine Karte gewinnt
+    # mit ihrer frühesten Linie (Minimum) und die Partie endet mit der frühesten Karte.
+    # Gibt pro Partie die Runde des ersten Bingos (1-basiert) und die Anzahl gleichzeitiger Gewinner zurück.
+    # Vorgegebene Partien: cards[g, p] sind die Wort-IDs der Karte zeilenweise, order[g] die gezogenen Wort-IDs.
+    cells = size * size
+    if cells > vocabulary_size:
+        raise ValueError(f"Zu wenige Wörter ({vocabulary_size}) für eine {size}x{size}-Karte.")
+    rng = np.random.default_rng(seed)
+
+    # Karten: die ersten size*size Einträge einer zufälligen Permutation je Spieler.
+    if cards is None:
+        cards = rng.random((num_games, num_players, vocabulary_size)).argsort(axis=-1)[..., :cells]
+    # Ziehung: draw_round[g, w] ist die (0-basierte) Runde, in der Wort w in Partie g gezogen wird.
+    if order is None:
+        order = rng.random((num_games, vocabulary_size)).argsort(axis=-1)
+    draw_round = np.empty_like(order)
+    np.put_along_axis(draw_round, order, np.arange(vocabulary_size), axis=-1)
+
+    cell_round = np.take_along_axis(draw_round[:, None, :], cards, axis=-1)
+    cell_round = cell_round.reshape(num_games, num_players, size, size)
+
+    diagonal = np.arange(size)
+    lines = np.concatenate([
+        cell_round.max(axis=3),                                      # Zeilen
+        cell_round.max(axis=2),                                      # Spalten
+        cell_round[..., diagonal, diagonal].max(axis=-1, keepdims=True),             # Hauptdiagonale
+        cell_round[..., diagonal, size - 1 - diagonal].max(axis=-1, keepdims=True),  # Gegendiagonale
+    ], axis=-1)
+    card_win_round = lines.min(axis=-1)
+    game_win_round = card_win_round.min(axis=-1)
+    winners = (card_win_round == game_win_round[:, None]).sum(axis=-1)
+    return game_win_round + 1, winners
+
+
+def _simulate_chunk(args):
+    return simulate_batch(*args)
+
+
+def run_simulation(num_games, num_players, size, words, seed=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Verteilt die Partien in festen Paketen auf alle Kerne. Jedes Paket erhält einen eigenen Seed aus
+    # SeedSequence, daher ist das Ergebnis bei gleichem Seed unabhängig von der Anzahl der Prozesse.
+    vocabulary_size = len(dict.fromkeys(words))
+    chunks = [min(chunk_size, num_games - start) for start in range(0, num_games, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    tasks = [(games, num_players, size, vocabulary_size, chunk_seed) for games, chunk_seed in zip(chunks, seeds)]
+
+    if workers == 1 or len(tasks) == 1:
+        results = [_simulate_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            results = list(executor.map(_simulate_chunk, tasks))
+    rounds = np.concatenate([result[0] for result in results])
+    winners = np.concatenate([result[1] for result in results])
+    return rounds, winners
+
+
+def summarize(rounds, winners):
+    # Fasst die Verteilung der Rundenanzahl zusammen.
+    counts = np.bincount(rounds)
+    return {
+        "games": int(rounds.size),
+        "mean": float(rounds.mean()),
+        "std": float(rounds.std()),
+        "min": int(rounds.min()),
+        "max": int(rounds.max()),
+        "percentiles": {p: float(np.percentile(rounds, p)) for p in (5, 25, 50, 75, 95, 99)},
+        "shared_wins": float((winners > 1).mean()),  # Anteil der Partien mit mehreren gleichzeitigen Gewinnern.
+        "histogram": {round_count: int(count) for round_count, count in enumerate(counts) if count},
+    }
+
+
+def print_summary(summary):
+    print(f"Partien: {summary['games']}")
+    print(f"Runden bis Bingo: Mittel {summary['mean']:.2f}, Std {summary['std']:.2f}, "
+          f"Min {summary['min']}, Max {summary['max']}")
+    print("Perzentile: " + ", ".join(f"p{p}={value:g}" for p, value in summary['percentiles'].items()))
+    print(f"Partien mit mehreren Gewinnern: {summary['shared_wins'] * 100:.2f} %")
+    peak = max(summary['histogram'].values())
+    for round_count, count in summary['histogram'].items():
+        bar = "#" * max(1, round(40 * count / peak))
+        print(f"{round_count:4d} {count:10d} {bar}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless-Simulation von Bingo-Partien")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--players", type=int, default=12)
+    parser.add_argument("--size", type=int, default=5)
+    parser.add_argument("--words", default="words.txt")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl der Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    words = read_words_from_file(args.words)
+    rounds, winners = run_simulation(args.games, args.players, args.size, words, args.seed, args.workers, args.chunk_size)
+    print_summary(summarize(rounds, winners))
+
+
+if __name__ == "__main__":
+    main()
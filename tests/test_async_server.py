@@ -0,0 +1,48 @@
+# Der asyncio-Server vergibt die Spieler-IDs nach der JOIN-Nachricht, nicht nach der Reihenfolge der Verbindungen.
+import asyncio
+
+import protocol
+from async_server import AsyncBingoServer
+from scheduler import RoundTiming
+
+WORDS = [f"Wort{i}" for i in range(20)]
+
+
+async def connect(port, name, player_id):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(protocol.encode_join(None, name, player_id))
+    decoder = protocol.FrameDecoder()
+    messages = []
+    while not messages:
+        messages = await protocol.read_messages(reader, decoder)
+    return reader, writer, decoder, protocol.decode_state(messages[0])
+
+
+async def play_reversed_connect_order():
+    server = AsyncBingoServer(2, WORDS, ["Alice", "Bob"], '127.0.0.1', 0, timing=RoundTiming(0.2, 0), card_size=2)
+    await server.start()
+    game = asyncio.ensure_future(server.play())
+    bob = await connect(server.server_port, "Bob", 1)  # Als Zweiter gestartet, aber zuerst verbunden.
+    alice = await connect(server.server_port, "Alice", 0)
+    reader, writer, decoder, state = bob
+    card = {word for row in state["card"] for word in row}
+    winner = None
+    while winner is None:
+        for message in await protocol.read_messages(reader, decoder):
+            if message.type == protocol.DRAW and message.payload in card:
+                writer.write(protocol.encode_batch([(protocol.MARK, message.seq, message.payload),
+                                                    (protocol.WIN, message.seq, "Bob")]))
+            elif message.type == protocol.WIN:
+                winner = message.payload
+    winner_id = await game
+    for _, other_writer, _, _ in (alice, bob):
+        other_writer.close()
+    await server.close()
+    return bob[3]["player_id"], alice[3]["player_id"], winner_id, winner
+
+
+def test_player_ids_follow_join_not_connect_order():
+    bob_id, alice_id, winner_id, winner = asyncio.run(play_reversed_connect_order())
+    assert (bob_id, alice_id) == (1, 0)
+    assert winner_id == 2
+    assert winner == "Bob"
@@ -0,0 +1,46 @@
+# Vergleicht die Trefferzähler von BingoCard mit der Referenzimplementierung check_winner und einer
+# vollständigen Zählung der Linien, denen genau ein Feld fehlt.
+import random
+
+import pytest
+
+from main import BingoCard, check_winner, mark_word_on_card
+
+
+def lines(size):
+    # Alle Linien als Listen von (y, x): Zeilen, Spalten und die beiden Diagonalen.
+    result = [[(y, x) for x in range(size)] for y in range(size)]
+    result += [[(y, x) for y in range(size)] for x in range(size)]
+    result.append([(i, i) for i in range(size)])
+    result.append([(i, size - 1 - i) for i in range(size)])
+    return result
+
+
+def one_away_brute_force(card):
+    return sum(1 for line in lines(card.size)
+               if sum(not card.is_marked(y, x) for y, x in line) == 1)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 7, 15])
+@pytest.mark.parametrize("seed", range(5))
+def test_counters_match_reference_after_every_mark(size, seed):
+    rng = random.Random(seed)
+    card = BingoCard([[f"w{y}-{x}" for x in range(size)] for y in range(size)])
+    cells = [(y, x) for y in range(size) for x in range(size)]
+    rng.shuffle(cells)
+    assert not card.has_bingo()
+    assert card.one_away() == one_away_brute_force(card)
+    for y, x in cells:
+        assert mark_word_on_card(card, y, x)
+        assert card.has_bingo() == check_winner(card, size)
+        assert card.one_away() == one_away_brute_force(card)
+    assert card.has_bingo()
+
+
+def test_marking_twice_changes_nothing():
+    card = BingoCard([["a", "b"], ["c", "d"]])
+    assert mark_word_on_card(card, 0, 0)
+    hits = list(card.line_hits)
+    assert not mark_word_on_card(card, 0, 0)
+    assert card.line_hits == hits
+    assert card.one_away() == one_away_brute_force(card)
@@ -0,0 +1,42 @@
+# Der Server prüft Markierungen und WIN-Meldungen anhand der zugeteilten Karten.
+from game_state import GameState
+from main import BingoCard
+
+
+def make_state():
+    cards = [BingoCard([["a", "b"], ["c", "d"]]), BingoCard([["e", "f"], ["g", "h"]])]
+    return GameState(2, cards)
+
+
+def test_win_without_bingo_is_rejected():
+    state = make_state()
+    state.start_round("a")
+    assert not state.declare_winner(2)
+    assert state.winner == 0
+    assert not state.winner_event.is_set()
+
+
+def test_mark_requires_word_on_own_card():
+    state = make_state()
+    state.start_round("a")
+    assert not state.record_mark(1, "a")  # Gezogen, aber nicht auf der Karte von Spieler 2.
+    assert not state.record_mark(0, "b")  # Auf der Karte, aber noch nicht gezogen.
+    assert state.record_mark(0, "a")
+    assert state.snapshot()["marks"] == [1, 0]
+
+
+def test_win_with_bingo_counts():
+    state = make_state()
+    for word in ("a", "b"):
+        state.start_round(word)
+        state.record_mark(0, word)
+    assert not state.declare_winner(2)
+    assert state.declare_winner(1)
+    assert state.winner == 1
+
+
+def test_without_cards_claims_are_not_checked():
+    state = GameState(2)
+    state.start_round("a")
+    assert state.record_mark(1, "a")
+    assert state.declare_winner(2)
@@ -0,0 +1,32 @@
+# Die Perzentile der Latenz-Histogramme müssen nah an den exakten Werten liegen, nicht nur an der Zweierpotenz.
+import random
+
+import pytest
+
+from metrics import Histogram
+
+
+def exact_percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+@pytest.mark.parametrize("low, high", [(0.034, 0.064), (0.0, 0.05), (0.004, 0.006), (2e-6, 5e-6), (1.0, 100.0)])
+def test_percentiles_within_a_few_percent(low, high):
+    rng = random.Random(low)
+    values = [rng.uniform(low, high) for _ in range(20000)]
+    histogram = Histogram()
+    for value in values:
+        histogram.observe(value)
+    for fraction in (0.5, 0.9, 0.99):
+        assert histogram.percentile(fraction) == pytest.approx(exact_percentile(values, fraction), rel=0.03)
+    assert histogram.percentile(1.0) == max(values)
+
+
+def test_single_value_and_empty():
+    histogram = Histogram()
+    assert histogram.percentile(0.5) == 0.0
+    histogram.observe(0.005)
+    assert histogram.percentile(0.5) == 0.005
+    histogram.observe(5e-7)  # Unter 1 µs.
+    assert histogram.percentile(0.0) == 5e-7
@@ -0,0 +1,79 @@
+# FrameDecoder muss dieselben Nachrichten liefern, egal wie TCP den Bytestrom aufteilt oder zusammenfasst.
+import socket
+
+import pytest
+
+import protocol
+from game_state import GameState
+from main import handle_player_connection
+
+MESSAGES = [
+    (protocol.DRAW, 1, "Synergie"),
+    (protocol.MARK, 1, "Größenvorteil"),
+    (protocol.STATE, 0, '{"card": [["Müßiggang", "Übergröße"], ["ÄÖÜ", "ß"]]}'),
+    (protocol.ACK, 2, ""),
+    (protocol.WIN, 3, "Jürgen"),
+]
+
+
+def decode_chunks(chunks):
+    decoder = protocol.FrameDecoder()
+    messages = []
+    for chunk in chunks:
+        messages += decoder.feed(chunk)
+    assert not decoder.buffer
+    return [tuple(message) for message in messages]
+
+
+def test_byte_by_byte():
+    data = protocol.encode_batch(MESSAGES)
+    assert decode_chunks(data[i:i + 1] for i in range(len(data))) == MESSAGES
+
+
+@pytest.mark.parametrize("chunk_size", [2, 3, 7, 10, 64, 100000])
+def test_coalesced_chunks(chunk_size):
+    # Mehrere Frames in einem Stück und Frame-Grenzen mitten in Kopf, Nutzlast oder Umlaut.
+    data = protocol.encode_batch(MESSAGES * 3)
+    assert decode_chunks(data[i:i + chunk_size] for i in range(0, len(data), chunk_size)) == MESSAGES * 3
+
+
+def test_invalid_frames_raise_value_error():
+    with pytest.raises(ValueError):
+        protocol.FrameDecoder().feed(protocol.HEADER.pack(1, 99, 0) + b"x")  # Unbekannter Typ.
+    with pytest.raises(ValueError):
+        protocol.FrameDecoder().feed(protocol.HEADER.pack(protocol.MAX_PAYLOAD + 1, protocol.DRAW, 0))
+    with pytest.raises(ValueError):
+        protocol.FrameDecoder().feed(protocol.HEADER.pack(1, protocol.MARK, 0) + b"\xc3")  # Halber Umlaut.
+
+
+def test_server_thread_survives_invalid_frame():
+    server, client = socket.socketpair()
+    dropped = []
+    with server, client:
+        client.sendall(protocol.HEADER.pack(1, 99, 0) + b"x")
+        handle_player_connection(server, 0, GameState(1), disconnect=dropped.append)  # Keine Ausnahme.
+        assert dropped == [server]  # Aus der Verteilerliste genommen ...
+        client.settimeout(1)
+        assert client.recv(1) == b""  # ... und geschlossen, der Spieler sieht das Ende der Verbindung.
+
+
+def join(**fields):
+    return protocol.FrameDecoder().feed(protocol.encode_join(None, **fields))[0]
+
+
+def test_join_player_id_follows_launch_id_not_connect_order():
+    names = ["Alice", "Bob", "Carol"]
+    taken = set()
+    for launch_id in (2, 0, 1):  # Die Spieler verbinden sich in anderer Reihenfolge, als sie gestartet wurden.
+        player_id = protocol.join_player_id(join(name=names[launch_id], player_id=launch_id), names, taken)
+        assert player_id == launch_id
+        taken.add(player_id)
+    assert protocol.join_player_id(join(name="Dave"), names, taken) is None
+
+
+def test_join_player_id_falls_back_to_name_and_free_id():
+    names = ["Alice", "Bob", "Carol"]
+    assert protocol.join_player_id(join(name="Carol"), names, set()) == 2
+    assert protocol.join_player_id(join(name="Bob", player_id=0), names, {0}) == 1  # Vergebene ID: über den Namen.
+    assert protocol.join_player_id(join(name="Dave", player_id=7), names, {0}) == 1
+    assert protocol.join_player_id(None, names, {1}) == 0  # Kein JOIN: erste freie ID.
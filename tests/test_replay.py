@@ -0,0 +1,68 @@
+# Nachprüfung aufgezeichneter Partien mit replay.py, für ältere Text-Logs und das aktuelle Format.
+import json
+
+from replay import GameReplay, ReplayState, read_entries, verify_log
+
+OLD_WINNER = """2024-06-01-12-00-00 Start des Spiels
+2024-06-01-12-00-00 Größe des Spielfelds: (3x3)
+2024-06-01-12-00-05 a (0,0)
+2024-06-01-12-00-09 b (1,1)
+2024-06-01-12-00-12 c (2,2)
+2024-06-01-12-00-12 Sieg
+"""
+
+OLD_LOSER = """2024-06-01-12-00-00 Start des Spiels
+2024-06-01-12-00-00 Größe des Spielfelds: (3x3)
+2024-06-01-12-00-05 d (0,1)
+2024-06-01-12-00-12 Sieg
+2024-06-01-12-05-12 Ende des Spiels
+"""
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_old_log_of_winner_is_verified(tmp_path):
+    result = verify_log(write(tmp_path, "gewinner.txt", OLD_WINNER))
+    assert result["claimed"] == 0 and result["verified"] and not result["unclear"]
+
+
+def test_old_log_of_loser_is_not_a_disputed_claim(tmp_path):
+    result = verify_log(write(tmp_path, "verlierer.txt", OLD_LOSER))
+    assert result["claimed"] is None and not result["verified"] and result["unclear"]
+
+
+def current_log(rounds, claim):
+    rows = [["a", "b"], ["c", "d"]]
+    lines = [json.dumps({"ts": 1.0, "mono": 1.0, "event": f"Karte von Ann: {json.dumps(rows)}", "player": 1})]
+    for round_count in range(1, rounds + 1):
+        word = "a" if round_count == 1 else "b" if round_count == rounds else f"x{round_count}"
+        event = f"Runde {round_count}: Das gezogene Wort lautet: {word}"
+        lines.append(json.dumps({"ts": 1.0, "mono": 1.0, "event": event, "round": round_count, "player": 1}))
+        if word in ("a", "b"):
+            y, x = (0, 0) if word == "a" else (0, 1)
+            lines.append(json.dumps({"ts": 1.0, "mono": 1.0, "event": f"{word} ({x},{y})", "round": round_count,
+                                     "player": 1, "cell": [y, x]}))
+    if claim:
+        lines.append(json.dumps({"ts": 1.0, "mono": 1.0, "event": "Sieg", "round": rounds, "player": 1}))
+    return "\n".join(lines) + "\n"
+
+
+def test_current_log_claim_is_verified(tmp_path):
+    result = verify_log(write(tmp_path, "spieler.jsonl", current_log(40, True)))
+    assert result["claimed"] == 40 and result["verified"] and not result["errors"]
+
+
+def test_jump_via_index_matches_full_scan(tmp_path):
+    path = write(tmp_path, "spieler.jsonl", current_log(40, True))
+    replay = GameReplay(path)
+    for round_count in (1, 15, 16, 17, 33, 40):
+        expected = ReplayState()
+        for _, entry in read_entries(path):
+            if entry.kind == "draw" and entry.round > round_count:
+                break
+            expected.apply(entry)
+        assert replay.state_at(round_count).checkpoint() == expected.checkpoint()
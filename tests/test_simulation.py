@@ -0,0 +1,27 @@
+# Die vektorisierte Simulation muss auf denselben Karten und derselben Ziehung dasselbe Ergebnis liefern wie die
+# Referenz mit create_bingo_card, mark_word_on_card und check_winner.
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from main import BingoCard  # noqa: E402
+from simulation import simulate_batch, simulate_game_reference  # noqa: E402
+
+
+@pytest.mark.parametrize("num_players, size, vocabulary_size", [(1, 1, 3), (2, 3, 12), (12, 5, 50), (4, 5, 25)])
+def test_batch_matches_reference(num_players, size, vocabulary_size):
+    num_games = 200
+    rng = np.random.default_rng(size * 100 + num_players)
+    cards = rng.random((num_games, num_players, vocabulary_size)).argsort(axis=-1)[..., :size * size]
+    order = rng.random((num_games, vocabulary_size)).argsort(axis=-1)
+    rounds, winners = simulate_batch(num_games, num_players, size, vocabulary_size, None, cards, order)
+
+    words = [f"Wort{i}" for i in range(vocabulary_size)]
+    for game in range(num_games):
+        bingo_cards = [BingoCard([[words[cell] for cell in card[row * size:(row + 1) * size]] for row in range(size)])
+                       for card in cards[game]]
+        draws = [words[word] for word in order[game]]
+        round_count, game_winners = simulate_game_reference(words, num_players, size, random, bingo_cards, draws)
+        assert (rounds[game], winners[game]) == (round_count, len(game_winners))